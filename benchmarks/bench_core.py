@@ -0,0 +1,161 @@
+import argparse
+import json
+import os
+import platform
+import tempfile
+import timeit
+
+from core.game_engine import GameEngine
+from core.longest_road import LongestRoadEngine
+from core.player import Player
+from core.simulation import AI_COLORS
+
+# Rounds of free building after the setup phase; 0 is the opening position, 40 saturates a 4-player board.
+DENSITIES = {'setup': 0, 'mid': 8, 'late': 20, 'dense': 40}
+SEED = 1234
+
+
+def build_fixture(density, seed=SEED, radius=2, num_players=4):
+    players = [Player(f"AI {i + 1}", AI_COLORS[i % len(AI_COLORS)], is_ai=True) for i in range(num_players)]
+    game = GameEngine(players, seed=seed, radius=radius)
+    while game.game_phase == 'SETUP':
+        game.play_ai_turn()
+
+    board, rng = game.board, game.rng
+    for _ in range(DENSITIES[density]):
+        for p in players:
+            roads = board.get_all_possible_road_spots(p)
+            if roads: board.place_road(rng.choice(roads), p)
+            spots = board.get_all_possible_settlement_spots(p)
+            if spots and rng.random() < 0.5: board.place_settlement(rng.choice(spots), p)
+            cities = board.get_all_possible_city_spots(p)
+            if cities and rng.random() < 0.3: board.upgrade_to_city(rng.choice(cities), p)
+    return game
+
+
+def bench_generate_board(game):
+    def run():
+        board = type(game.board)(game.rng, game.board.radius)
+        board.generate_random_board()
+    return run
+
+
+def bench_distribute_resources(game):
+    def run():
+        for roll in range(2, 13):
+            game.board.distribute_resources(roll)
+    return run
+
+
+def bench_settlement_spots(game):
+    def run():
+        for p in game.players:
+            game.board.get_all_possible_settlement_spots(p)
+    return run
+
+
+def bench_road_spots(game):
+    def run():
+        for p in game.players:
+            game.board.get_all_possible_road_spots(p)
+    return run
+
+
+def bench_longest_road(game):
+    def run():
+        for p in game.players:
+            game.board.calculate_longest_road(p)
+    return run
+
+
+def bench_longest_road_rebuild(game):
+    def run():
+        LongestRoadEngine(game.board)
+    return run
+
+
+def bench_check_achievements(game):
+    return game.rules_manager.check_achievements
+
+
+def bench_save_load(game):
+    fd, path = tempfile.mkstemp(prefix="catan_bench_", suffix=".pkl")
+    os.close(fd)
+
+    def run():
+        game.storage_manager.save_game(path)
+        game.storage_manager.load_game(path)
+    # Called by run_benchmarks once the timing is done
+    run.cleanup = lambda: os.remove(path)
+    return run
+
+
+BENCHMARKS = {
+    'generate_random_board': bench_generate_board,
+    'distribute_resources': bench_distribute_resources,
+    'settlement_spots': bench_settlement_spots,
+    'road_spots': bench_road_spots,
+    'longest_road': bench_longest_road,
+    'longest_road_rebuild': bench_longest_road_rebuild,
+    'check_achievements': bench_check_achievements,
+    'save_load': bench_save_load,
+}
+
+
+def time_call(func, repeat):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number * 1e6, number
+
+
+def run_benchmarks(names, densities, repeat, radius=2, num_players=4):
+    results = []
+    for density in densities:
+        for name in names:
+            game = build_fixture(density, radius=radius, num_players=num_players)
+            run = BENCHMARKS[name](game)
+            try:
+                usec, loops = time_call(run, repeat)
+            finally:
+                if hasattr(run, 'cleanup'): run.cleanup()
+            results.append({'benchmark': name, 'density': density, 'radius': radius, 'players': num_players,
+                            'usec': round(usec, 3), 'loops': loops})
+            print(f"{name:<24}{density:<8}{usec:>12.2f} us")
+    return results
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = {(r['benchmark'], r['density']): r['usec'] for r in json.load(f)['results']}
+
+    print(f"\nCompared to {baseline_path}:")
+    for r in results:
+        old = baseline.get((r['benchmark'], r['density']))
+        if old:
+            print(f"{r['benchmark']:<24}{r['density']:<8}{old / r['usec']:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the board and rules hot paths.")
+    parser.add_argument('-b', '--benchmark', action='append', choices=list(BENCHMARKS), help="run only these")
+    parser.add_argument('-d', '--density', action='append', choices=list(DENSITIES), help="fixture densities")
+    parser.add_argument('--radius', type=int, default=2, help="board radius of the fixtures")
+    parser.add_argument('-p', '--players', type=int, default=4, help="players in the fixtures")
+    parser.add_argument('-r', '--repeat', type=int, default=5, help="timing repeats, the best one is kept")
+    parser.add_argument('-o', '--output', help="write results as JSON to this file")
+    parser.add_argument('-c', '--compare', help="JSON file from an earlier run to print speedups against")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.benchmark or list(BENCHMARKS), args.density or list(DENSITIES), args.repeat,
+                             args.radius, args.players)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({'python': platform.python_version(), 'seed': SEED, 'results': results}, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
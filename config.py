@@ -2,9 +2,40 @@ import os
 SCREEN_WIDTH = 1200
 SCREEN_HEIGHT = 800
 FPS = 60
+DIRTY_RECTS = True
+IDLE_MODE = True
+
+# Balanced layouts written by generate_boards.py; games fall back to unconstrained boards without it.
+BOARD_POOL_FILE = "boards.json"
 CAPTION = "Catan Board Generator"
 
 HEX_RADIUS = 60
+# Hex rings around the centre tile (2 is the standard 19-tile board); hexes shrink to fit larger boards.
+BOARD_RADIUS = 2
+NUM_PLAYERS = 4
+
+# None keeps the rule-based AI; 'mcts' makes every AI player search its moves.
+AI_SEARCH = None
+MCTS_ITERATIONS = 500
+MCTS_TIME_BUDGET = None  # seconds per decision, overrides MCTS_ITERATIONS when set
+MCTS_WORKERS = 1  # more than 1 runs a root-parallel search on a process pool of this size
+MCTS_TABLE_SIZE = 1 << 16  # transposition table slots per AI player
+AI_DECISION_BUDGET = None  # seconds an AI may think about one move, None for no limit
+AI_TURN_BUDGET = None  # seconds an AI may think during a whole turn; later moves fall back to a quick heuristic
+AI_PLAYER_TRADES = True  # AIs trade with each other before building
+AI_SEARCH_SLICE = 0.012  # seconds of AI search per frame, so the window keeps drawing while an AI thinks
+WIN_PROBABILITY_BAR = True  # estimate win chances in a background process and show them under the panel
+WIN_PROBABILITY_ROLLOUTS = 200  # rollouts per estimated position
+
+# The first player is the human, the rest are AIs; supports up to six players.
+PLAYER_COLORS = [
+    ('Red', (255, 50, 50)),
+    ('Blue', (50, 50, 255)),
+    ('Green', (34, 139, 34)),
+    ('Orange', (255, 140, 0)),
+    ('White', (240, 240, 240)),
+    ('Brown', (139, 69, 19)),
+]
 
 BG_COLOR = (65, 105, 225)
 COLOR_LINE = (0, 0, 0)
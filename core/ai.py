@@ -1,27 +1,59 @@
-import random
-import pygame
+from core.game_state import BoardTables, GameState, RESOURCES
+
+# Milliseconds the GUI lingers after each kind of AI action
+ACTION_PAUSES = {'city': 1500, 'settlement': 1500, 'road': 1500, 'dev_card': 1000}
 
 
 class AIController:
+    # Turns are generators that yield how many milliseconds to pause before the next step, so the GUI
+    # can pace them with its frame clock while headless games simply run them to the end.
     def __init__(self, game_instance):
         self.game = game_instance
         self.board = game_instance.board
-
-    def wait(self, ms):
-        pygame.time.delay(ms)
-        self.game.draw()
+        self._tables = None
+        self._tables_robber = None
+        self.thinking = 0.0
+
+    def get_search(self, player):
+        # Players with a search in game.searches pick their moves with it; the others keep the random rules.
+        return self.game.searches.get(self.game.players.index(player))
+
+    def get_state(self, pending_robber=False):
+        # The tables hold a snapshot of the vertex scores, which change with the robber's tile.
+        robber = next((i for i, t in enumerate(self.board.tiles) if t.has_robber), -1)
+        if self._tables is None or self._tables_robber != robber:
+            self._tables = BoardTables(self.board)
+            self._tables_robber = robber
+        return GameState.from_game(self.game, self._tables, pending_robber)
+
+    def decision_budget(self):
+        # Seconds the next decision may think: the per-decision budget, cut to what is left of the turn's.
+        limits = []
+        if self.game.decision_budget is not None: limits.append(self.game.decision_budget)
+        if self.game.turn_budget is not None: limits.append(max(self.game.turn_budget - self.thinking, 0.0))
+        return min(limits) if limits else None
+
+    def search_choice(self, search, pending_robber=False):
+        # Runs the search in slices of game.search_slice seconds, yielding a frame between them.
+        action = yield from search.iter_choose(self.get_state(pending_robber), self.game.rng, self.game.search_slice,
+                                               self.decision_budget())
+        self.thinking += search.last_seconds
+        return action
 
     def run_setup_turn(self, player):
+        self.thinking = 0.0
         self.game.set_message(f"AI ({player.name}) is thinking...", duration=500)
-        self.wait(500)
+        yield 500
 
+        search = self.get_search(player)
         if self.game.setup_subphase == 'SETTLEMENT':
             valid_spots = self.board.get_all_possible_settlement_spots(player, initial_phase=True)
             if valid_spots:
-                target = random.choice(valid_spots)
+                if search: target = (yield from self.search_choice(search))[1]
+                else: target = self.board.vertex_values.best_for(player, valid_spots)
                 if self.board.place_settlement(target, player, initial_phase=True):
                     self.game.set_message("AI placed a Settlement!", duration=1000)
-                    self.wait(1000)
+                    yield 1000
                     self.game.rules_manager.advance_setup_step()
             else:
                 self.game.rules_manager.advance_setup_step()
@@ -29,98 +61,130 @@ class AIController:
         elif self.game.setup_subphase == 'ROAD':
             valid_spots = self.board.get_all_possible_road_spots(player)
             if valid_spots:
-                target = random.choice(valid_spots)
+                if search: target = (yield from self.search_choice(search))[1]
+                else: target = self.board.vertex_values.best_road(valid_spots)
                 if self.board.place_road(target, player):
                     self.game.set_message("AI placed a Road!", duration=1000)
-                    self.wait(1000)
+                    yield 1000
                     self.game.rules_manager.advance_setup_step()
             else:
                 self.game.set_message("AI skips road (Map Error)", 1000)
-                self.wait(1000)
+                yield 1000
                 self.game.rules_manager.advance_setup_step()
 
     def run_main_turn(self, player):
+        self.thinking = 0.0
 
-        if player.dev_cards['knight'] > 0 and random.random() < 0.3:
+        if player.dev_cards['knight'] > 0 and self.game.rng.random() < 0.3:
             self.game.rules_manager.play_dev_card('knight')
 
         if not self.game.dice_rolled_this_turn:
             self.game.set_message(f"{player.name} is rolling dice...", duration=1000)
-            self.wait(1000)
+            yield 1000
 
-            d = random.randint(1, 6) + random.randint(1, 6)
-            self.game.last_dice_roll = d
-            self.game.dice_rolled_this_turn = True
+            d = self.game.roll_dice()
 
             self.game.set_message(f"{player.name} Rolled: {d}", duration=1500)
-            self.wait(1500)
+            yield 1500
 
             if d == 7:
-                self.handle_robber_logic(player)
+                yield from self.handle_robber_logic(player)
             else:
-                self.board.distribute_resources(d)
-                self.wait(500)
+                yield 500
+
+        if self.game.player_trades:
+            yield from self.handle_trade_logic(player)
 
-        self.handle_building_logic(player)
+        yield from self.handle_building_logic(player)
 
         self.game.set_message(f"{player.name} ends turn.", duration=1000)
-        self.wait(1000)
+        yield 1000
 
-        self.game.current_player_idx = (self.game.current_player_idx + 1) % len(self.game.players)
-        self.game.dice_rolled_this_turn = False
-        self.game.last_dice_roll = 0
+        self.game.end_turn()
 
     def handle_robber_logic(self, player):
         self.game.set_message(f"{player.name} moves the ROBBER!", duration=2000)
-        self.wait(1000)
+        yield 1000
 
         valid_tiles = [t for t in self.board.tiles if not t.has_robber]
         if valid_tiles:
-            target = random.choice(valid_tiles)
+            search = self.get_search(player)
+            if search: target = self.board.tiles[(yield from self.search_choice(search, pending_robber=True))[1]]
+            else: target = self.game.rng.choice(valid_tiles)
             self.board.move_robber(target)
             self.game.rules_manager.execute_robber_theft(target)
-            self.wait(2500)
+            yield 2500
+
+    def handle_trade_logic(self, player):
+        response = self.game.trade_engine.best_trade(player)
+        if response:
+            self.game.trade_engine.execute(player, response)
+            yield 1500
 
     def handle_building_logic(self, player):
+        search = self.get_search(player)
+        if search:
+            yield from self.search_building_logic(player, search)
+            return
+
         if player.can_afford('city'):
-            for s in player.settlements:
-                if self.board.upgrade_to_city(s, player):
+            spots = self.board.get_all_possible_city_spots(player)
+            if spots:
+                if self.board.upgrade_to_city(self.board.vertex_values.top(1, spots)[0], player):
                     player.deduct_resources('city')
                     self.game.set_message("AI built a CITY!", duration=1500)
-                    self.wait(1500)
+                    yield 1500
                     return
 
         if player.can_afford('settlement'):
             spots = self.board.get_all_possible_settlement_spots(player)
             if spots:
-                if self.board.place_settlement(random.choice(spots), player):
+                if self.board.place_settlement(self.board.vertex_values.best_for(player, spots), player):
                     player.deduct_resources('settlement')
                     self.game.set_message("AI built a SETTLEMENT!", duration=1500)
-                    self.wait(1500)
+                    self.game.rules_manager.check_achievements()
+                    yield 1500
                     return
 
         if player.can_afford('road'):
             spots = self.board.get_all_possible_road_spots(player)
             if spots:
-                if self.board.place_road(random.choice(spots), player):
+                if self.board.place_road(self.board.vertex_values.best_road(spots), player):
                     player.deduct_resources('road')
                     self.game.set_message("AI built a ROAD!", duration=1500)
-                    self.wait(1500)
+                    yield 1500
                     self.game.rules_manager.check_achievements()
 
-    def evaluate_trade_offer_specific(self, ai_player, offer_give, offer_get):
-        for res, amt in offer_get.items():
-            if ai_player.resources.get(res, 0) < amt:
-                return False, "I don't have those resources."
-
-        count_give = sum(offer_give.values())
-        count_get = sum(offer_get.values())
-
-        ai_needs = [r for r, q in ai_player.resources.items() if q == 0]
-        getting_needed = any(r in ai_needs for r in offer_give)
-
-        if count_give > count_get: return True, "Deal!"
-        if count_give == count_get and getting_needed: return True, "Deal!"
-        if count_give == count_get and random.random() < 0.2: return True, "Ok, fine."
-
-        return False, "No deal."
\ No newline at end of file
+    def search_building_logic(self, player, search):
+        # Every action but 'end' spends resources, so a turn always runs out of choices.
+        while True:
+            action = yield from self.search_choice(search)
+            if action is None or action[0] == 'end': return
+            if not self.apply_action(player, action): return
+            yield ACTION_PAUSES.get(action[0], 0)
+
+    def apply_action(self, player, action):
+        kind = action[0]
+        if kind == 'city':
+            if not self.board.upgrade_to_city(action[1], player): return False
+            player.deduct_resources('city')
+            self.game.set_message("AI built a CITY!", duration=1500)
+        elif kind == 'settlement':
+            if not self.board.place_settlement(action[1], player): return False
+            player.deduct_resources('settlement')
+            self.game.set_message("AI built a SETTLEMENT!", duration=1500)
+            self.game.rules_manager.check_achievements()
+        elif kind == 'road':
+            if not self.board.place_road(action[1], player): return False
+            player.deduct_resources('road')
+            self.game.set_message("AI built a ROAD!", duration=1500)
+            self.game.rules_manager.check_achievements()
+        elif kind == 'dev_card':
+            card = self.board.draw_dev_card()
+            if not card: return False
+            player.deduct_resources('dev_card')
+            player.dev_cards[card] += 1
+            self.game.set_message("AI bought a Development Card", duration=1000)
+        elif kind == 'trade':
+            return player.trade_with_bank(RESOURCES[action[1]], RESOURCES[action[2]])
+        return True
@@ -1,12 +1,31 @@
 import math
 import random
-from core.entities import HexTile
+
+import config
+from core.entities import HexTile, CORNER_OFFSETS, HEX_DIRECTIONS
+from core.board_generator import generate_balanced_layout
+from core.move_generator import MoveGenerator
+from core.longest_road import LongestRoadEngine
+from core.spatial_index import SpatialIndex
+from core.vertex_values import VertexValues
+from core.zobrist import zobrist_key, PIECE, ROAD, ROBBER
+
+
+RESOURCE_DECK = ['wood'] * 4 + ['sheep'] * 4 + ['wheat'] * 4 + ['brick'] * 3 + ['ore'] * 3
+NUMBER_TOKENS = [2, 12] + [3, 4, 5, 6, 8, 9, 10, 11] * 2
+PORT_TYPES = ['wood', 'brick', 'sheep', 'wheat', 'ore'] + ['3:1'] * 4
+DEV_DECK = ['knight'] * 14 + ['vp'] * 5 + ['road_building'] * 2 + ['year_of_plenty'] * 2 + ['monopoly'] * 2
+# Order in which leftover tiles and tokens are handed out when a deck does not divide the board evenly.
+EXTRA_RESOURCES = ['wood', 'sheep', 'wheat', 'brick', 'ore']
+EXTRA_NUMBERS = [6, 8, 5, 9, 4, 10, 3, 11, 2, 12]
 
 
 class Board:
-    def __init__(self):
+    def __init__(self, rng=None, radius=2):
+        self.rng = rng if rng is not None else random.Random()
         self.tiles = []
-        self.radius = 2
+        self.radius = radius
+        self.hex_size = HexTile.fit_size(radius)
 
         self.built_settlements = {}
         self.built_cities = {}
@@ -15,73 +34,186 @@ class Board:
         self.dev_card_deck = []
         self.ports = []
 
-    def generate_random_board(self):
+        self.vertex_positions = []
+        self.vertex_neighbors = []
+        self.vertex_tiles = []
+        self.vertex_edges = []
+        self.edge_vertices = []
+        self.edge_tiles = []
+        self.edge_lookup = {}
+        self.vertex_ports = {}
+
+        self.tile_map = {}
+        self.vertex_index = SpatialIndex([])
+        self.edge_index = SpatialIndex([])
+        self.coastal_edges = []
+
+        self.production = {roll: {} for roll in range(2, 13)}
+        self.moves = MoveGenerator(self)
+        self.longest_road = LongestRoadEngine(self)
+        self.vertex_values = VertexValues(self)
+
+        # Zobrist hash of the pieces and the robber, updated by every placement. seats maps each player to
+        # the index its pieces are hashed under and is filled in by the game.
+        self.zobrist = 0
+        self.seats = {}
+
+    def generate_random_board(self, constraints=None):
         coords = self._get_hex_grid_coords()
         resources = self._get_shuffled_resources()
         numbers = self._get_shuffled_numbers()
-        self.tiles = []
 
-        for q, r in coords:
-            res_type = resources.pop()
-            if res_type == 'desert':
-                new_tile = HexTile(q, r, res_type, None)
-                new_tile.has_robber = True
-            else:
-                new_tile = HexTile(q, r, res_type, numbers.pop())
-            self.tiles.append(new_tile)
+        if constraints:
+            layout = generate_balanced_layout(coords, resources, numbers, self.rng, constraints)
+        else:
+            layout = []
+            for q, r in coords:
+                res_type = resources.pop()
+                layout.append((q, r, res_type, None if res_type == 'desert' else numbers.pop()))
+
+        self.generate_from_layout(layout)
 
+    def generate_from_layout(self, layout):
+        self.tiles = []
+        self.production = {roll: {} for roll in range(2, 13)}
+        self.radius = max(max(abs(q), abs(r), abs(q + r)) for q, r, _, _ in layout)
+        self.hex_size = HexTile.fit_size(self.radius)
+
+        for q, r, res_type, number in layout:
+            self.tiles.append(HexTile(q, r, res_type, number, self.hex_size))
+        # Larger boards have several deserts but there is still a single robber, starting on the first.
+        desert = next((t for t in self.tiles if t.resource_type == 'desert'), None)
+        if desert: desert.has_robber = True
+
+        self.zobrist = zobrist_key(ROBBER, next((i for i, t in enumerate(self.tiles) if t.has_robber), -1))
+        self._build_topology()
         self._generate_ports()
+        self.vertex_values = VertexValues(self)
         self._initialize_dev_deck()
 
+    def get_layout(self):
+        return [(t.q, t.r, t.resource_type, t.number_token) for t in self.tiles]
+
+    def _build_topology(self):
+        # Vertices are keyed on an integer lattice (x in units of size*sqrt(3)/2, y in units of size/2)
+        # so that corners shared by neighbouring hexes get the same id without float comparisons.
+        vertex_by_key = {}
+        self.vertex_positions = []
+        vertex_tiles = []
+        self.edge_vertices = []
+        edge_tiles = []
+        self.edge_lookup = {}
+
+        for tile in self.tiles:
+            ids = []
+            corners = tile.get_vertices()
+            for i, (dx, dy) in enumerate(CORNER_OFFSETS):
+                key = (2 * tile.q + tile.r + dx, 3 * tile.r + dy)
+                vid = vertex_by_key.get(key)
+                if vid is None:
+                    vid = len(self.vertex_positions)
+                    vertex_by_key[key] = vid
+                    self.vertex_positions.append(corners[i])
+                    vertex_tiles.append([])
+                vertex_tiles[vid].append(tile)
+                ids.append(vid)
+            tile.vertex_ids = tuple(ids)
+
+            edge_ids = []
+            for i in range(6):
+                v1, v2 = ids[i], ids[(i + 1) % 6]
+                key = (min(v1, v2), max(v1, v2))
+                eid = self.edge_lookup.get(key)
+                if eid is None:
+                    eid = len(self.edge_vertices)
+                    self.edge_lookup[key] = eid
+                    self.edge_vertices.append(key)
+                    edge_tiles.append([])
+                edge_tiles[eid].append(tile)
+                edge_ids.append(eid)
+            tile.edge_ids = tuple(edge_ids)
+
+        neighbors = [[] for _ in self.vertex_positions]
+        edges = [[] for _ in self.vertex_positions]
+        for eid, (v1, v2) in enumerate(self.edge_vertices):
+            neighbors[v1].append(v2)
+            neighbors[v2].append(v1)
+            edges[v1].append(eid)
+            edges[v2].append(eid)
+
+        self.vertex_neighbors = [tuple(n) for n in neighbors]
+        self.vertex_edges = [tuple(e) for e in edges]
+        self.vertex_tiles = [tuple(t) for t in vertex_tiles]
+        self.edge_tiles = [tuple(t) for t in edge_tiles]
+        self.moves = MoveGenerator(self)
+        self.longest_road = LongestRoadEngine(self)
+
+        self.tile_map = {(t.q, t.r): t for t in self.tiles}
+        self.coastal_edges = self._get_coastal_edges()
+        self.vertex_index = SpatialIndex(enumerate(self.vertex_positions))
+        midpoints = {}
+        for tile in self.tiles:
+            midpoints.update(zip(tile.edge_ids, tile.edge_midpoints))
+        self.edge_index = SpatialIndex(sorted(midpoints.items()))
+
+    def _get_coastal_edges(self):
+        if not self.tiles: return []
+        center_x = sum(t.pixel_x for t in self.tiles) / len(self.tiles)
+        center_y = sum(t.pixel_y for t in self.tiles) / len(self.tiles)
+
+        def ring_angle(eid):
+            p1, p2 = self.get_edge_points(eid)
+            return math.atan2((p1[1] + p2[1]) / 2 - center_y, (p1[0] + p2[0]) / 2 - center_x)
+
+        coast = [eid for eid, tiles in enumerate(self.edge_tiles) if len(tiles) == 1]
+        return sorted(coast, key=ring_angle)
+
+    def get_edge_points(self, edge_id):
+        v1, v2 = self.edge_vertices[edge_id]
+        return self.vertex_positions[v1], self.vertex_positions[v2]
+
+    def get_tile_at(self, x, y):
+        # The pick circle of a tile reaches slightly past its hex, so the neighbours are checked as well.
+        q, r = HexTile.pixel_to_hex(x, y, self.hex_size)
+        for dq, dr in ((0, 0),) + HEX_DIRECTIONS:
+            tile = self.tile_map.get((q + dq, r + dr))
+            if tile and tile.contains_point(x, y): return tile
+        return None
+
+    def pick_threshold(self):
+        # 15 px on full-size hexes, shrinking with them on larger boards
+        return 15 * self.hex_size / config.HEX_RADIUS
+
+    def get_nearest_vertex(self, x, y, threshold=None):
+        return self.vertex_index.nearest(x, y, threshold or self.pick_threshold())
+
+    def get_nearest_edge(self, x, y, threshold=None):
+        return self.edge_index.nearest(x, y, threshold or self.pick_threshold())
+
     def _generate_ports(self):
         self.ports = []
-        port_types = ['wood', 'brick', 'sheep', 'wheat', 'ore'] + ['3:1'] * 4
-        random.shuffle(port_types)
-
-        outer_tiles = []
-        tile_map = {(t.q, t.r): t for t in self.tiles}
-        directions = [(1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1)]
-
-        for t in self.tiles:
-            neighbors = 0
-            for dq, dr in directions:
-                if (t.q + dq, t.r + dr) in tile_map: neighbors += 1
-            if neighbors < 6:
-                outer_tiles.append(t)
-
-        possible_edges = []
-        for t in outer_tiles:
-            edges = t.get_edges()
-            for e in edges:
-                is_shared = False
-                for other in self.tiles:
-                    if other == t: continue
-                    other_edges = other.get_edges()
-                    e_int = tuple(sorted([(int(p[0]), int(p[1])) for p in e]))
-                    for oe in other_edges:
-                        oe_int = tuple(sorted([(int(p[0]), int(p[1])) for p in oe]))
-                        if e_int == oe_int:
-                            is_shared = True;
-                            break
-                if not is_shared:
-                    possible_edges.append(e)
-
-        random.shuffle(possible_edges)
-        count = min(len(port_types), len(possible_edges))
-        step = 2 if len(possible_edges) >= count * 2 else 1
-
-        idx_edge = 0
-        for i in range(count):
-            if idx_edge >= len(possible_edges): break
-            ptype = port_types[i]
-            edge = possible_edges[idx_edge]
-            self.ports.append({'edge': edge, 'type': ptype})
-            idx_edge += step
+        # The standard 9 ports on a 30-edge coast; larger boards keep the same density.
+        coast = self.coastal_edges
+        count = min(round(len(PORT_TYPES) * len(coast) / 30), len(coast))
+        port_types = (PORT_TYPES * (count // len(PORT_TYPES) + 1))[:count]
+        self.rng.shuffle(port_types)
+
+        # Coastal edges are already in ring order, so equally spaced picks spread the ports around the island.
+        if count:
+            offset = self.rng.randrange(len(coast))
+            spacing = len(coast) / count
+            for i in range(count):
+                edge = coast[(offset + int(i * spacing)) % len(coast)]
+                self.ports.append({'edge': edge, 'type': port_types[i]})
+
+        self.vertex_ports = {}
+        for port in self.ports:
+            for vid in self.edge_vertices[port['edge']]:
+                self.vertex_ports[vid] = port['type']
 
     def _initialize_dev_deck(self):
-        self.dev_card_deck = ['knight'] * 14 + ['vp'] * 5 + ['road_building'] * 2 + ['year_of_plenty'] * 2 + [
-            'monopoly'] * 2
-        random.shuffle(self.dev_card_deck)
+        self.dev_card_deck = DEV_DECK * max(1, round(len(self.tiles) / 19))
+        self.rng.shuffle(self.dev_card_deck)
 
     def draw_dev_card(self):
         return self.dev_card_deck.pop() if self.dev_card_deck else None
@@ -93,172 +225,136 @@ class Board:
                 if -self.radius <= q + r <= self.radius: coords.append((q, r))
         return coords
 
+    def _tile_count(self):
+        return 3 * self.radius * (self.radius + 1) + 1
+
+    def _desert_count(self):
+        # One desert per 19 tiles, as on the standard board.
+        return max(1, round(self._tile_count() / 19))
+
+    @staticmethod
+    def _scaled_deck(base, extras, size):
+        copies, left = divmod(size, len(base))
+        return base * copies + (extras * (left // len(extras) + 1))[:left]
+
     def _get_shuffled_resources(self):
-        deck = ['wood'] * 4 + ['sheep'] * 4 + ['wheat'] * 4 + ['brick'] * 3 + ['ore'] * 3 + ['desert'] * 1
-        random.shuffle(deck);
+        producing = self._tile_count() - self._desert_count()
+        deck = self._scaled_deck(RESOURCE_DECK, EXTRA_RESOURCES, producing) + ['desert'] * self._desert_count()
+        self.rng.shuffle(deck);
         return deck
 
     def _get_shuffled_numbers(self):
-        tokens = [2, 12] + [3, 4, 5, 6, 8, 9, 10, 11] * 2
-        random.shuffle(tokens);
+        tokens = self._scaled_deck(NUMBER_TOKENS, EXTRA_NUMBERS, self._tile_count() - self._desert_count())
+        self.rng.shuffle(tokens);
         return tokens
 
     def move_robber(self, target_hex):
-        for tile in self.tiles: tile.has_robber = False
+        old = -1
+        for i, tile in enumerate(self.tiles):
+            if tile.has_robber:
+                old = i
+                tile.has_robber = False
+                self._update_tile_production(tile)
         target_hex.has_robber = True
+        self._update_tile_production(target_hex)
+        self.vertex_values.on_robber(target_hex, *([self.tiles[old]] if old >= 0 else []))
+        self.zobrist ^= zobrist_key(ROBBER, old) ^ zobrist_key(ROBBER, self.tiles.index(target_hex))
+
+    def _update_production(self, vertex_id, tile):
+        # production[roll] maps (vertex, tile) -> (player, resource, amount) for every producing building
+        if tile.number_token is None: return
+        entries = self.production[tile.number_token]
+        key = (vertex_id, tile)
+        owner = self.built_settlements.get(vertex_id)
+        amount = 1
+        if not owner:
+            owner = self.built_cities.get(vertex_id)
+            amount = 2
+
+        if owner and not tile.has_robber:
+            entries[key] = (owner, tile.resource_type, amount)
+        else:
+            entries.pop(key, None)
+
+    def _update_tile_production(self, tile):
+        for vid in tile.vertex_ids:
+            self._update_production(vid, tile)
+
+    def _update_vertex_production(self, vertex_id):
+        for tile in self.vertex_tiles[vertex_id]:
+            self._update_production(vertex_id, tile)
 
     def distribute_resources(self, roll_number):
-        target_tiles = [t for t in self.tiles if t.number_token == roll_number]
-        for tile in target_tiles:
-            if tile.has_robber: continue
-            for vx, vy in tile.get_vertices():
-                for loc, owner in self.built_settlements.items():
-                    if math.sqrt((vx - loc[0]) ** 2 + (vy - loc[1]) ** 2) < 5: owner.add_resource(tile.resource_type, 1)
-                for loc, owner in self.built_cities.items():
-                    if math.sqrt((vx - loc[0]) ** 2 + (vy - loc[1]) ** 2) < 5: owner.add_resource(tile.resource_type, 2)
-
-    def _is_near(self, p1, p2, threshold=5):
-        return math.sqrt((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2) < threshold
-
-    def place_settlement(self, node_coords, player, initial_phase=False):
-        for existing in list(self.built_settlements.keys()) + list(self.built_cities.keys()):
-            if self._is_near(node_coords, existing, 5): return False
-            if self._is_near(node_coords, existing, 50): return False
-
-        if not initial_phase:
-            connected = False
-            for edge, owner in self.built_roads.items():
-                if owner == player:
-                    if self._is_near(edge[0], node_coords) or self._is_near(edge[1], node_coords):
-                        connected = True;
-                        break
-            if not connected: return False
-
-        self.built_settlements[node_coords] = player
-        player.settlements.append(node_coords)
+        for player, resource, amount in self.production.get(roll_number, {}).values():
+            player.add_resource(resource, amount)
+            player.resources_produced[resource] += amount
 
-        for port in self.ports:
-            p1, p2 = port['edge']
-            if self._is_near(node_coords, p1) or self._is_near(node_coords, p2):
-                player.update_trade_ratios(port['type'])
+    def get_building_owner(self, vertex_id):
+        return self.built_settlements.get(vertex_id) or self.built_cities.get(vertex_id)
 
-        return True
+    def can_place_settlement(self, vertex_id, player, initial_phase=False):
+        return self.moves.can_settle(vertex_id, player, initial_phase)
 
-    def place_road(self, edge_coords, player):
-        p1, p2 = edge_coords
+    def place_settlement(self, vertex_id, player, initial_phase=False):
+        if not self.can_place_settlement(vertex_id, player, initial_phase): return False
 
-        for existing, owner in self.built_roads.items():
-            e1, e2 = existing
-            match1 = (self._is_near(p1, e1) and self._is_near(p2, e2))
-            match2 = (self._is_near(p1, e2) and self._is_near(p2, e1))
-            if match1 or match2: return False
+        self.built_settlements[vertex_id] = player
+        player.settlements.append(vertex_id)
+        self.zobrist ^= zobrist_key(PIECE, vertex_id, self.seats.get(player, -1), 1)
+        self.moves.on_settlement(vertex_id, player)
+        self.longest_road.on_settlement(vertex_id, player)
+        self.vertex_values.on_settlement(vertex_id)
+        self._update_vertex_production(vertex_id)
 
-        connected = False
+        port_type = self.vertex_ports.get(vertex_id)
+        if port_type: player.update_trade_ratios(port_type)
 
-        for loc, owner in self.built_settlements.items():
-            if owner == player and (self._is_near(p1, loc) or self._is_near(p2, loc)): connected = True; break
-        if not connected:
-            for loc, owner in self.built_cities.items():
-                if owner == player and (self._is_near(p1, loc) or self._is_near(p2, loc)): connected = True; break
+        return True
 
-        if not connected:
-            for existing, owner in self.built_roads.items():
-                if owner == player:
-                    e1, e2 = existing
-                    if self._is_near(p1, e1) or self._is_near(p1, e2) or self._is_near(p2, e1) or self._is_near(p2, e2):
-                        connected = True;
-                        break
+    def can_place_road(self, edge_id, player):
+        return self.moves.can_build_road(edge_id, player)
 
-        if not connected: return False
+    def place_road(self, edge_id, player):
+        if not self.can_place_road(edge_id, player): return False
 
-        self.built_roads[edge_coords] = player
-        player.roads.append(edge_coords)
+        self.built_roads[edge_id] = player
+        player.roads.append(edge_id)
+        self.zobrist ^= zobrist_key(ROAD, edge_id, self.seats.get(player, -1))
+        self.moves.on_road(edge_id, player)
+        self.longest_road.on_road(edge_id, player)
         return True
 
-    def upgrade_to_city(self, node_coords, player):
-        target_node = None
-        for loc, owner in self.built_settlements.items():
-            if owner == player and self._is_near(node_coords, loc):
-                target_node = loc
-                break
-
-        if target_node:
-            del self.built_settlements[target_node]
-            self.built_cities[target_node] = player
-            player.cities.append(target_node)
-            return True
-        return False
+    def upgrade_to_city(self, vertex_id, player):
+        if self.built_settlements.get(vertex_id) != player: return False
+
+        del self.built_settlements[vertex_id]
+        self.built_cities[vertex_id] = player
+        seat = self.seats.get(player, -1)
+        self.zobrist ^= zobrist_key(PIECE, vertex_id, seat, 1) ^ zobrist_key(PIECE, vertex_id, seat, 2)
+        player.settlements.remove(vertex_id)
+        player.cities.append(vertex_id)
+        self.moves.on_city(vertex_id, player)
+        self._update_vertex_production(vertex_id)
+        return True
 
     def get_all_possible_settlement_spots(self, player, initial_phase=False):
-        valid = []
-        for tile in self.tiles:
-            for v in tile.get_vertices():
-                if self.place_settlement(v, player, initial_phase):
-                    if v in self.built_settlements: del self.built_settlements[v]
-                    if v in player.settlements: player.settlements.remove(v)
-                    valid.append(v)
-        return valid
+        return self.moves.get_settlement_spots(player, initial_phase)
 
     def get_all_possible_road_spots(self, player):
-        valid = []
-        for tile in self.tiles:
-            for e in tile.get_edges():
-                if self.place_road(e, player):
-                    if e in self.built_roads: del self.built_roads[e]
-                    if e in player.roads: player.roads.remove(e)
-                    valid.append(e)
-        return valid
-
-    def get_resources_from_node(self, node):
-        res = []
-        for tile in self.tiles:
-            if tile.resource_type == 'desert': continue
-            for v in tile.get_vertices():
-                if self._is_near(v, node): res.append(tile.resource_type)
-        return res
-
-    def calculate_longest_road(self, player):
-        roads = [e for e, o in self.built_roads.items() if o == player]
-        if not roads: return 0
-
-        def to_key(p):
-            return (int(p[0]), int(p[1]))
-
-        adj = {}
-        for p1, p2 in roads:
-            k1, k2 = to_key(p1), to_key(p2)
-            adj.setdefault(k1, []).append(k2)
-            adj.setdefault(k2, []).append(k1)
+        return self.moves.get_road_spots(player)
 
-        max_len = 0
+    def get_all_possible_city_spots(self, player):
+        return self.moves.get_city_spots(player)
 
-        def dfs(curr, visited, length):
-            nonlocal max_len
-            max_len = max(max_len, length)
-            for neigh in adj.get(curr, []):
-                edge = tuple(sorted((curr, neigh)))
-                if edge not in visited:
-                    visited.add(edge)
-                    dfs(neigh, visited, length + 1)
-                    visited.remove(edge)
+    def get_resources_from_node(self, vertex_id):
+        return [t.resource_type for t in self.vertex_tiles[vertex_id] if t.resource_type != 'desert']
 
-        for start_node in adj:
-            dfs(start_node, set(), 0)
-
-        return max_len
+    def calculate_longest_road(self, player):
+        return self.longest_road.get_length(player)
 
     def get_players_on_tile(self, tile):
-        owners = set()
-        vertices = tile.get_vertices()
-
-        for loc, owner in self.built_settlements.items():
-            for v in vertices:
-                if self._is_near(v, loc):
-                    owners.add(owner)
-
-        for loc, owner in self.built_cities.items():
-            for v in vertices:
-                if self._is_near(v, loc):
-                    owners.add(owner)
-
-        return list(owners)
\ No newline at end of file
+        owners = {}
+        for vid in tile.vertex_ids:
+            owner = self.get_building_owner(vid)
+            if owner: owners[owner] = True
+        return list(owners)
@@ -0,0 +1,146 @@
+import json
+
+from core.entities import CORNER_OFFSETS, HEX_DIRECTIONS
+
+PIPS = {2: 1, 3: 2, 4: 3, 5: 4, 6: 5, 8: 5, 9: 4, 10: 3, 11: 2, 12: 1}
+RED_NUMBERS = (6, 8)
+
+
+class BoardConstraints:
+    # no_adjacent_red: 6s and 8s never touch. no_adjacent_same_number: equal tokens never touch.
+    # max_same_resource_neighbors: how many neighbours of a tile may share its resource (None = no limit).
+    # max_vertex_pips: highest pip total allowed on any intersection (None = no limit).
+    def __init__(self, no_adjacent_red=True, no_adjacent_same_number=True, max_same_resource_neighbors=1,
+                 max_vertex_pips=12, max_nodes=20000, max_restarts=50):
+        self.no_adjacent_red = no_adjacent_red
+        self.no_adjacent_same_number = no_adjacent_same_number
+        self.max_same_resource_neighbors = max_same_resource_neighbors
+        self.max_vertex_pips = max_vertex_pips
+        self.max_nodes = max_nodes
+        self.max_restarts = max_restarts
+
+
+class _SearchBudgetExceeded(Exception):
+    pass
+
+
+def _neighbors(coords):
+    present = set(coords)
+    return {(q, r): [(q + dq, r + dr) for dq, dr in HEX_DIRECTIONS if (q + dq, r + dr) in present]
+            for q, r in coords}
+
+
+def _corners(coords):
+    # coord -> lattice keys of its six corners, and corner -> coords of the tiles around it
+    tile_corners = {}
+    corner_tiles = {}
+    for q, r in coords:
+        keys = [(2 * q + r + dx, 3 * r + dy) for dx, dy in CORNER_OFFSETS]
+        tile_corners[(q, r)] = keys
+        for key in keys:
+            corner_tiles.setdefault(key, []).append((q, r))
+    return tile_corners, corner_tiles
+
+
+def _search_order(coords):
+    # Centre outwards, so every tile after the first has assigned neighbours to prune against.
+    return sorted(coords, key=lambda c: (max(abs(c[0]), abs(c[1]), abs(c[0] + c[1])), c))
+
+
+def _assign(order, counts, fits, rng, budget):
+    assignment = {}
+
+    def place(i):
+        if i == len(order): return True
+        budget[0] -= 1
+        if budget[0] < 0: raise _SearchBudgetExceeded()
+
+        coord = order[i]
+        options = [value for value, left in counts.items() if left > 0]
+        rng.shuffle(options)
+        for value in options:
+            if not fits(coord, value, assignment): continue
+            assignment[coord] = value
+            counts[value] -= 1
+            if place(i + 1): return True
+            counts[value] += 1
+            del assignment[coord]
+        return False
+
+    return assignment if place(0) else None
+
+
+def generate_balanced_layout(coords, resources, numbers, rng, constraints):
+    neighbors = _neighbors(coords)
+    tile_corners, corner_tiles = _corners(coords)
+    order = _search_order(coords)
+
+    def resource_fits(coord, res, assigned):
+        limit = constraints.max_same_resource_neighbors
+        if limit is None or res == 'desert': return True
+        same = [n for n in neighbors[coord] if assigned.get(n) == res]
+        if len(same) > limit: return False
+        for n in same:
+            if sum(1 for m in neighbors[n] if assigned.get(m) == res) + 1 > limit: return False
+        return True
+
+    def number_fits(coord, number, assigned):
+        for n in neighbors[coord]:
+            other = assigned.get(n)
+            if other is None: continue
+            if constraints.no_adjacent_red and number in RED_NUMBERS and other in RED_NUMBERS: return False
+            if constraints.no_adjacent_same_number and number == other: return False
+
+        if constraints.max_vertex_pips is not None:
+            for key in tile_corners[coord]:
+                pips = PIPS[number] + sum(PIPS[assigned[c]] for c in corner_tiles[key] if c in assigned)
+                if pips > constraints.max_vertex_pips: return False
+        return True
+
+    for _ in range(constraints.max_restarts):
+        budget = [constraints.max_nodes]
+        try:
+            res_counts = {}
+            for res in resources: res_counts[res] = res_counts.get(res, 0) + 1
+            placed = _assign(order, res_counts, resource_fits, rng, budget)
+            if placed is None: continue
+
+            producing = [c for c in order if placed[c] != 'desert']
+            num_counts = {}
+            for n in numbers: num_counts[n] = num_counts.get(n, 0) + 1
+            tokens = _assign(producing, num_counts, number_fits, rng, budget)
+            if tokens is None: continue
+        except _SearchBudgetExceeded:
+            continue
+
+        return [(q, r, placed[(q, r)], tokens.get((q, r))) for q, r in coords]
+
+    raise ValueError("Could not generate a board satisfying the constraints")
+
+
+class BoardPool:
+    # Pre-generated balanced layouts stored as JSON, so a game can start without running the search.
+    def __init__(self, layouts=None, radius=2):
+        self.layouts = layouts or []
+        self.radius = radius
+
+    def fill(self, count, rng, constraints):
+        from core.board import Board
+
+        for _ in range(count):
+            board = Board(rng, self.radius)
+            board.generate_random_board(constraints)
+            self.layouts.append(board.get_layout())
+
+    def draw(self, rng):
+        return rng.choice(self.layouts)
+
+    def save(self, filename):
+        with open(filename, "w") as f:
+            json.dump({'radius': self.radius, 'layouts': self.layouts}, f)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename) as f:
+            data = json.load(f)
+        return cls([[tuple(tile) for tile in layout] for layout in data['layouts']], data['radius'])
@@ -1,73 +1,85 @@
 import math
 import config
 
+# Axial neighbour directions, and each hex corner on an integer lattice relative to (2q + r, 3r).
+HEX_DIRECTIONS = ((1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1))
+CORNER_OFFSETS = ((1, -1), (1, 1), (0, 2), (-1, 1), (-1, -1), (0, -2))
+
 
 class HexTile:
-    def __init__(self, q, r, resource_type, number_token):
+    __slots__ = ('q', 'r', 'resource_type', 'number_token', 'size', 'pixel_x', 'pixel_y', 'vertices', 'edges',
+                 'edge_midpoints', 'vertex_ids', 'edge_ids', 'is_highlighted', 'has_robber')
+
+    def __init__(self, q, r, resource_type, number_token, size=config.HEX_RADIUS):
         self.q = q
         self.r = r
         self.resource_type = resource_type
         self.number_token = number_token
+        self.size = size
 
         self.pixel_x, self.pixel_y = self._hex_to_pixel(q, r)
 
+        # Tiles never move, so their corners are computed once and shared by every caller.
+        self.vertices = self._compute_vertices()
+        self.edges = tuple((self.vertices[i], self.vertices[(i + 1) % 6]) for i in range(6))
+        self.edge_midpoints = tuple(((p1[0] + p2[0]) / 2, (p1[1] + p2[1]) / 2) for p1, p2 in self.edges)
+
+        self.vertex_ids = ()
+        self.edge_ids = ()
+
         self.is_highlighted = False
         self.has_robber = False
 
-    def _hex_to_pixel(self, q, r):
-        size = config.HEX_RADIUS
+    @staticmethod
+    def fit_size(radius):
+        # Largest hex size (capped at HEX_RADIUS) that keeps a board of this radius inside the play area.
+        max_w = config.SCREEN_WIDTH - 360
+        max_h = config.SCREEN_HEIGHT - 80
+        return min(config.HEX_RADIUS, max_h / (3 * radius + 2), max_w / (math.sqrt(3) * (2 * radius + 1)))
+
+    @staticmethod
+    def _board_center():
+        return config.SCREEN_WIDTH // 2 + 130, config.SCREEN_HEIGHT // 2
 
-        center_x = config.SCREEN_WIDTH // 2 + 130
-        center_y = config.SCREEN_HEIGHT // 2
+    def _hex_to_pixel(self, q, r):
+        size = self.size
+        center_x, center_y = self._board_center()
 
         x = center_x + size * math.sqrt(3) * (q + r / 2)
         y = center_y + size * 3 / 2 * r
 
         return x, y
 
-    def get_vertices(self):
+    @staticmethod
+    def pixel_to_hex(x, y, size=config.HEX_RADIUS):
+        center_x, center_y = HexTile._board_center()
+
+        fr = (y - center_y) / (size * 3 / 2)
+        fq = (x - center_x) / (size * math.sqrt(3)) - fr / 2
+
+        # Cube rounding: round all three coordinates and fix the one with the largest error.
+        fs = -fq - fr
+        q, r, s = round(fq), round(fr), round(fs)
+        dq, dr, ds = abs(q - fq), abs(r - fr), abs(s - fs)
+        if dq > dr and dq > ds:
+            q = -r - s
+        elif dr > ds:
+            r = -q - s
+        return q, r
+
+    def _compute_vertices(self):
         vertices = []
         for i in range(6):
             angle_deg = 60 * i - 30
             angle_rad = math.pi / 180 * angle_deg
-            vx = self.pixel_x + config.HEX_RADIUS * math.cos(angle_rad)
-            vy = self.pixel_y + config.HEX_RADIUS * math.sin(angle_rad)
+            vx = self.pixel_x + self.size * math.cos(angle_rad)
+            vy = self.pixel_y + self.size * math.sin(angle_rad)
             vertices.append((vx, vy))
-        return vertices
+        return tuple(vertices)
 
-    def get_edges(self):
-        verts = self.get_vertices()
-        edges = []
-        for i in range(len(verts)):
-            p1 = verts[i]
-            p2 = verts[(i + 1) % 6]
-            edges.append((p1, p2))
-        return edges
+    def get_vertices(self):
+        return self.vertices
 
     def contains_point(self, x, y):
-        dist = math.sqrt((x - self.pixel_x) ** 2 + (y - self.pixel_y) ** 2)
-        return dist < config.HEX_RADIUS * 0.9
-
-    def get_nearest_vertex(self, x, y):
-        best_v = None
-        min_dist = float('inf')
-        for v in self.get_vertices():
-            dist = math.sqrt((x - v[0]) ** 2 + (y - v[1]) ** 2)
-            if dist < min_dist:
-                min_dist = dist
-                best_v = v
-        if min_dist < 15: return best_v
-        return None
-
-    def get_nearest_edge(self, x, y):
-        best_e = None
-        min_dist = float('inf')
-        for p1, p2 in self.get_edges():
-            mid_x = (p1[0] + p2[0]) / 2
-            mid_y = (p1[1] + p2[1]) / 2
-            dist = math.sqrt((x - mid_x) ** 2 + (y - mid_y) ** 2)
-            if dist < min_dist:
-                min_dist = dist
-                best_e = (p1, p2)
-        if min_dist < 15: return best_e
-        return None
\ No newline at end of file
+        limit = self.size * 0.9
+        return (x - self.pixel_x) ** 2 + (y - self.pixel_y) ** 2 < limit * limit
@@ -0,0 +1,149 @@
+import random
+
+import config
+from core.board import Board
+from core.player import Player
+from core.ai import AIController
+from core.rules_manager import RulesManager
+from core.storage_manager import StorageManager
+from core.trade_engine import TradeEngine
+from core.game_state import RESOURCES
+from core.zobrist import hand_key, dev_key, holders_key, deck_key, turn_key
+
+
+class GameEngine:
+    # Board, players, rules, AI and the turn loop, without any pygame dependency.
+    # The GUI in main.py subclasses this and steps AI turns from its frame loop instead of running them at once.
+    def __init__(self, players=None, seed=None, board_pool=None, radius=config.BOARD_RADIUS,
+                 num_players=config.NUM_PLAYERS, searches=None, decision_budget=config.AI_DECISION_BUDGET,
+                 turn_budget=config.AI_TURN_BUDGET, player_trades=config.AI_PLAYER_TRADES):
+        # Every random decision of a game (board, dice, robber, AI) draws from this one generator,
+        # so a game is fully reproducible from its seed.
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        if board_pool and board_pool.radius != radius:
+            raise ValueError(f"Board pool has radius {board_pool.radius}, the game needs radius {radius}")
+        self.board = Board(self.rng, radius)
+        if board_pool:
+            self.board.generate_from_layout(board_pool.draw(self.rng))
+        else:
+            self.board.generate_random_board()
+
+        if players is None:
+            name, color = config.PLAYER_COLORS[0]
+            players = [Player(f"Human ({name})", color, is_ai=False)]
+            for i in range(1, num_players):
+                name, color = config.PLAYER_COLORS[i % len(config.PLAYER_COLORS)]
+                players.append(Player(f"AI {i} ({name})", color, is_ai=True))
+        self.players = players
+        self.board.seats = {p: i for i, p in enumerate(players)}
+        # Player index -> MCTS used for that AI's decisions
+        self.searches = searches or {}
+        # Seconds of search per frame when AI turns are stepped by a frame loop; None searches in one go.
+        self.search_slice = None
+        # Thinking time limits (seconds) for searching AIs, per decision and per turn; None is unlimited.
+        self.decision_budget = decision_budget
+        self.turn_budget = turn_budget
+        # Whether AIs offer trades to the other AIs during their turns
+        self.player_trades = player_trades
+
+        self.ai_brain = AIController(self)
+        self.rules_manager = RulesManager(self)
+        self.storage_manager = StorageManager(self)
+        self.trade_engine = TradeEngine(self)
+
+        self.game_phase = 'SETUP'
+
+        num_players = len(self.players)
+        self.setup_order = list(range(num_players)) + list(range(num_players - 1, -1, -1))
+
+        self.setup_step_idx = 0
+        self.setup_subphase = 'SETTLEMENT'
+
+        self.current_player_idx = self.setup_order[0]
+        self.winner = None
+        self.turn_count = 0
+
+        self.interaction_mode = 'view'
+        self.trade_offer = None
+
+        self.p2p_offer = {'give': {}, 'get': {}}
+        self.p2p_active_side = 'give'
+        self.p2p_target_idx = 0
+        self.p2p_responses = []
+
+        self.last_dice_roll = 0
+        self.dice_rolled_this_turn = False
+        self.yop_selected_resources = []
+        self.message = "SETUP PHASE: Place Settlement"
+        self.message_timer = 0
+
+    def get_current_player(self):
+        return self.players[self.current_player_idx]
+
+    def set_message(self, text, duration=2000):
+        self.message = text
+        self.message_timer = duration
+
+    def reinit_controllers(self):
+        self.ai_brain = AIController(self)
+        self.rules_manager = RulesManager(self)
+        self.trade_engine = TradeEngine(self)
+        # Hashes leave the board layout out, so results stored for the previous board must not carry over.
+        for search in self.searches.values():
+            if search.table is not None: search.table.clear()
+
+    def check_winner(self):
+        if self.winner: return self.winner
+        for p in self.players:
+            if p.update_victory_points() >= 10: self.winner = p.name
+        return self.winner
+
+    def state_hash(self, pending_robber=False):
+        # Same value as GameState.from_game(self).hash: the board keeps its part up to date itself, and the
+        # hands, cards and turn are folded in here since Player fields are written directly all over the game.
+        h = self.board.zobrist
+        for i, p in enumerate(self.players):
+            h ^= hand_key(i, tuple(p.resources[r] for r in RESOURCES))
+            h ^= dev_key(i, p.dev_cards['vp'], p.dev_cards['knight'], p.knights_played)
+
+        army = next((i for i, p in enumerate(self.players) if p.has_largest_army), -1)
+        road = next((i for i, p in enumerate(self.players) if p.has_longest_road), -1)
+        deck = self.board.dev_card_deck
+        knights, vps = deck.count('knight'), deck.count('vp')
+        h ^= holders_key(army, road) ^ deck_key((knights, vps, len(deck) - knights - vps))
+        return h ^ turn_key(self.current_player_idx, self.game_phase, self.setup_step_idx, self.setup_subphase,
+                            self.dice_rolled_this_turn, pending_robber)
+
+    def roll_dice(self):
+        d = self.rng.randint(1, 6) + self.rng.randint(1, 6)
+        self.last_dice_roll = d
+        self.dice_rolled_this_turn = True
+        if d != 7:
+            self.board.distribute_resources(d)
+        return d
+
+    def end_turn(self):
+        self.current_player_idx = (self.current_player_idx + 1) % len(self.players)
+        self.dice_rolled_this_turn = False
+        self.last_dice_roll = 0
+        self.turn_count += 1
+
+    def start_ai_turn(self):
+        # Returns the current AI's turn as a generator yielding the pause (ms) wanted before each next step.
+        curr = self.get_current_player()
+        if self.game_phase == 'SETUP':
+            return self.ai_brain.run_setup_turn(curr)
+        return self.ai_brain.run_main_turn(curr)
+
+    def play_ai_turn(self):
+        for _ in self.start_ai_turn(): pass
+
+    def run(self, max_turns=1000):
+        # Headless loop for games where every player is an AI.
+        while not self.check_winner() and self.turn_count < max_turns:
+            if not self.get_current_player().is_ai:
+                raise ValueError("GameEngine.run needs every player to be an AI")
+            self.play_ai_turn()
+        return self.winner
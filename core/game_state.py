@@ -0,0 +1,564 @@
+from core.vertex_values import MISSING_RESOURCE_BONUS
+from core.zobrist import (zobrist_key, hand_key, dev_key, holders_key, deck_key, turn_key, PIECE, ROAD,
+                          ROBBER)
+
+RESOURCES = ('wood', 'brick', 'sheep', 'wheat', 'ore')
+
+# Costs as (wood, brick, sheep, wheat, ore)
+ROAD_COST = (1, 1, 0, 0, 0)
+SETTLEMENT_COST = (1, 1, 1, 1, 0)
+CITY_COST = (0, 0, 0, 2, 3)
+DEV_CARD_COST = (0, 0, 1, 1, 1)
+
+END = ('end',)
+DEV_CARD = ('dev_card',)
+
+
+class BoardTables:
+    # Everything about a board that does not change during a game, as flat tuples indexed by vertex,
+    # edge and tile id. Shared by every GameState cloned from the same board.
+    def __init__(self, board):
+        self.vertex_neighbors = tuple(board.vertex_neighbors)
+        self.vertex_edges = tuple(board.vertex_edges)
+        self.edge_vertices = tuple(board.edge_vertices)
+
+        tile_index = {tile: i for i, tile in enumerate(board.tiles)}
+        self.vertex_tiles = tuple(tuple(tile_index[t] for t in tiles) for tiles in board.vertex_tiles)
+        self.tile_vertices = tuple(t.vertex_ids for t in board.tiles)
+        self.tile_resource = tuple(RESOURCES.index(t.resource_type) if t.resource_type in RESOURCES else -1
+                                   for t in board.tiles)
+        self.tile_number = tuple(t.number_token for t in board.tiles)
+        self.roll_tiles = {roll: tuple(i for i, n in enumerate(self.tile_number) if n == roll) for roll in range(2, 13)}
+        # Placement scores for the rollout policy, as they stand when the tables are built
+        self.vertex_score = tuple(board.vertex_values.scores)
+
+        # None, -1 for a 3:1 port, or the resource index of a 2:1 port
+        ports = [None] * len(board.vertex_positions)
+        for vid, port_type in board.vertex_ports.items():
+            ports[vid] = -1 if port_type == '3:1' else RESOURCES.index(port_type)
+        self.vertex_port = tuple(ports)
+
+
+class GameState:
+    # A compact, cheaply cloned copy of a game for search and rollouts. Players, vertices, edges and tiles
+    # are plain indices; per-player tuples are replaced rather than mutated, so clone() only copies outer lists.
+    __slots__ = ('tables', 'num_players', 'setup_order', 'vertex_owner', 'vertex_level', 'edge_owner', 'robber',
+                 'hands', 'ratios', 'roads', 'buildings', 'settlement_count', 'city_count', 'dev_vp', 'knight_cards',
+                 'knights_played', 'road_length', 'army_holder', 'road_holder', 'dev_deck', 'current', 'phase',
+                 'setup_step', 'setup_subphase', 'dice_rolled', 'pending_robber', 'turn', 'winner', 'hash')
+
+    @classmethod
+    def from_game(cls, game, tables=None, pending_robber=False):
+        board = game.board
+        players = game.players
+        index = {p: i for i, p in enumerate(players)}
+        s = cls.__new__(cls)
+
+        s.tables = tables or BoardTables(board)
+        s.num_players = len(players)
+        s.setup_order = tuple(game.setup_order)
+
+        s.vertex_owner = [-1] * len(board.vertex_positions)
+        s.vertex_level = [0] * len(board.vertex_positions)
+        for vid, p in board.built_settlements.items():
+            s.vertex_owner[vid] = index[p]
+            s.vertex_level[vid] = 1
+        for vid, p in board.built_cities.items():
+            s.vertex_owner[vid] = index[p]
+            s.vertex_level[vid] = 2
+        s.edge_owner = [-1] * len(board.edge_vertices)
+        roads = [[] for _ in players]
+        for eid, p in board.built_roads.items():
+            s.edge_owner[eid] = index[p]
+            roads[index[p]].append(eid)
+        s.robber = next((i for i, t in enumerate(board.tiles) if t.has_robber), -1)
+
+        s.hands = [tuple(p.resources[r] for r in RESOURCES) for p in players]
+        s.ratios = [tuple(min(p.trade_ratios[r], p.general_port_ratio) for r in RESOURCES) for p in players]
+        s.roads = [tuple(r) for r in roads]
+        s.buildings = [tuple(p.settlements + p.cities) for p in players]
+        s.settlement_count = [len(p.settlements) for p in players]
+        s.city_count = [len(p.cities) for p in players]
+        s.dev_vp = [p.dev_cards['vp'] for p in players]
+        s.knight_cards = [p.dev_cards['knight'] for p in players]
+        s.knights_played = [p.knights_played for p in players]
+        s.road_length = [board.calculate_longest_road(p) for p in players]
+        s.army_holder = next((i for i, p in enumerate(players) if p.has_largest_army), -1)
+        s.road_holder = next((i for i, p in enumerate(players) if p.has_longest_road), -1)
+
+        # Development deck as counts of (knight, vp, progress); the AI never plays progress cards.
+        deck = board.dev_card_deck
+        s.dev_deck = (deck.count('knight'), deck.count('vp'), len(deck) - deck.count('knight') - deck.count('vp'))
+
+        s.current = game.current_player_idx
+        s.phase = game.game_phase
+        s.setup_step = game.setup_step_idx
+        s.setup_subphase = game.setup_subphase
+        s.dice_rolled = game.dice_rolled_this_turn
+        s.pending_robber = pending_robber
+        s.turn = game.turn_count
+        # As in the engine, a win is only declared once the player acts or ends the turn.
+        s.winner = None
+        s.hash = s.compute_hash()
+        return s
+
+    def clone(self):
+        s = GameState.__new__(GameState)
+        s.tables = self.tables
+        s.num_players = self.num_players
+        s.setup_order = self.setup_order
+        s.vertex_owner = self.vertex_owner[:]
+        s.vertex_level = self.vertex_level[:]
+        s.edge_owner = self.edge_owner[:]
+        s.robber = self.robber
+        s.hands = self.hands[:]
+        s.ratios = self.ratios[:]
+        s.roads = self.roads[:]
+        s.buildings = self.buildings[:]
+        s.settlement_count = self.settlement_count[:]
+        s.city_count = self.city_count[:]
+        s.dev_vp = self.dev_vp[:]
+        s.knight_cards = self.knight_cards[:]
+        s.knights_played = self.knights_played[:]
+        s.road_length = self.road_length[:]
+        s.army_holder = self.army_holder
+        s.road_holder = self.road_holder
+        s.dev_deck = self.dev_deck
+        s.current = self.current
+        s.phase = self.phase
+        s.setup_step = self.setup_step
+        s.setup_subphase = self.setup_subphase
+        s.dice_rolled = self.dice_rolled
+        s.pending_robber = self.pending_robber
+        s.turn = self.turn
+        s.winner = self.winner
+        s.hash = self.hash
+        return s
+
+    def compute_hash(self):
+        # 64-bit Zobrist hash of the position, kept up to date by every move while self.hash is not None.
+        h = zobrist_key(ROBBER, self.robber)
+        for vid, p in enumerate(self.vertex_owner):
+            if p >= 0: h ^= zobrist_key(PIECE, vid, p, self.vertex_level[vid])
+        for eid, p in enumerate(self.edge_owner):
+            if p >= 0: h ^= zobrist_key(ROAD, eid, p)
+        for p in range(self.num_players):
+            h ^= hand_key(p, self.hands[p]) ^ dev_key(p, self.dev_vp[p], self.knight_cards[p], self.knights_played[p])
+        return h ^ self._volatile_key()
+
+    def _volatile_key(self):
+        # The parts that many moves touch at once; apply() swaps them out and back in as a whole.
+        return (turn_key(self.current, self.phase, self.setup_step, self.setup_subphase, self.dice_rolled,
+                         self.pending_robber) ^ holders_key(self.army_holder, self.road_holder) ^ deck_key(self.dev_deck))
+
+    def victory_points(self, p):
+        points = self.settlement_count[p] + 2 * self.city_count[p] + self.dev_vp[p]
+        if self.army_holder == p: points += 2
+        if self.road_holder == p: points += 2
+        return points
+
+    def is_decision(self):
+        # A point where the current player chooses between actions, rather than rolling dice.
+        return self.winner is None and (self.phase == 'SETUP' or self.pending_robber or self.dice_rolled)
+
+    # --- legal moves ---
+
+    def _is_free(self, vid):
+        owner = self.vertex_owner
+        if owner[vid] >= 0: return False
+        for n in self.tables.vertex_neighbors[vid]:
+            if owner[n] >= 0: return False
+        return True
+
+    def _reach(self, p):
+        ev = self.tables.edge_vertices
+        reach = set(self.buildings[p])
+        for eid in self.roads[p]:
+            reach.update(ev[eid])
+        return reach
+
+    def settlement_spots(self, p):
+        if self.phase == 'SETUP':
+            return [v for v in range(len(self.vertex_owner)) if self._is_free(v)]
+        ev = self.tables.edge_vertices
+        spots = set()
+        for eid in self.roads[p]:
+            for v in ev[eid]:
+                if self._is_free(v): spots.add(v)
+        return sorted(spots)
+
+    def road_spots(self, p):
+        edge_owner = self.edge_owner
+        vertex_edges = self.tables.vertex_edges
+        spots = set()
+        for v in self._reach(p):
+            for eid in vertex_edges[v]:
+                if edge_owner[eid] < 0: spots.add(eid)
+        return sorted(spots)
+
+    def city_spots(self, p):
+        return [v for v in self.buildings[p] if self.vertex_level[v] == 1]
+
+    def can_afford(self, p, cost):
+        h = self.hands[p]
+        return h[0] >= cost[0] and h[1] >= cost[1] and h[2] >= cost[2] and h[3] >= cost[3] and h[4] >= cost[4]
+
+    def legal_actions(self):
+        if self.winner is not None: return []
+        p = self.current
+        if self.phase == 'SETUP':
+            if self.setup_subphase == 'SETTLEMENT':
+                return [('settlement', v) for v in self.settlement_spots(p)]
+            return [('road', e) for e in self.road_spots(p)]
+        if self.pending_robber:
+            return [('robber', t) for t in range(len(self.tables.tile_number)) if t != self.robber]
+        if not self.dice_rolled: return [('roll',)]
+
+        actions = [END]
+        if self.can_afford(p, CITY_COST):
+            actions.extend(('city', v) for v in self.city_spots(p))
+        if self.can_afford(p, SETTLEMENT_COST):
+            actions.extend(('settlement', v) for v in self.settlement_spots(p))
+        if self.can_afford(p, ROAD_COST):
+            actions.extend(('road', e) for e in self.road_spots(p))
+        if self.can_afford(p, DEV_CARD_COST) and sum(self.dev_deck): actions.append(DEV_CARD)
+
+        hand, ratios = self.hands[p], self.ratios[p]
+        for give in range(5):
+            if hand[give] >= ratios[give]:
+                actions.extend(('trade', give, get) for get in range(5) if get != give)
+        return actions
+
+    def placement_scores(self, p, spots):
+        # Board score of each vertex plus a bonus per resource around it that p does not produce yet, as the
+        # rule-based AI ranks its placements.
+        tables = self.tables
+        produced = {tables.tile_resource[t] for v in self.buildings[p] for t in tables.vertex_tiles[v]}
+        return {v: tables.vertex_score[v] + MISSING_RESOURCE_BONUS *
+                len({tables.tile_resource[t] for t in tables.vertex_tiles[v]} - produced - {-1}) for v in spots}
+
+    def quick_action(self):
+        # A cheap heuristic move for when there is no time left to search.
+        actions = self.legal_actions()
+        if not actions: return None
+        tables, owner, p = self.tables, self.vertex_owner, self.current
+        scores = tables.vertex_score
+
+        def value(action):
+            kind = action[0]
+            if kind == 'city': return 100 + scores[action[1]]
+            if kind == 'settlement': return 50 + scores[action[1]]
+            if kind == 'road' and self.phase == 'SETUP':
+                near = [n for v in tables.edge_vertices[action[1]] for n in (v,) + tables.vertex_neighbors[v]]
+                return max((scores[n] for n in near if self._is_free(n)), default=0)
+            if kind == 'robber':
+                hurt = 0
+                for v in tables.tile_vertices[action[1]]:
+                    if owner[v] >= 0: hurt += self.vertex_level[v] * (-3 if owner[v] == p else 1)
+                return hurt
+            if kind == 'end': return 0
+            return -1
+
+        return max(actions, key=value)
+
+    # --- applying moves ---
+
+    def _set_hand(self, p, hand):
+        if self.hash is not None: self.hash ^= hand_key(p, self.hands[p]) ^ hand_key(p, hand)
+        self.hands[p] = hand
+
+    def _pay(self, p, cost):
+        self._set_hand(p, tuple(h - c for h, c in zip(self.hands[p], cost)))
+
+    def _gain(self, p, res, amount=1):
+        hand = list(self.hands[p])
+        hand[res] += amount
+        self._set_hand(p, tuple(hand))
+
+    def apply(self, action, rng):
+        kind = action[0]
+        p = self.current
+        hashing = self.hash is not None
+        if hashing:
+            self.hash ^= self._volatile_key() ^ dev_key(p, self.dev_vp[p], self.knight_cards[p], self.knights_played[p])
+
+        if kind == 'end': self._end_turn()
+        elif kind == 'roll': self.roll(rng)
+        elif kind == 'settlement': self._settle(action[1], p)
+        elif kind == 'road': self._road(action[1], p)
+        elif kind == 'city': self._city(action[1], p)
+        elif kind == 'robber': self._move_robber(action[1], p, rng)
+        elif kind == 'dev_card': self._buy_dev_card(p, rng)
+        elif kind == 'trade':
+            hand = list(self.hands[p])
+            hand[action[1]] -= self.ratios[p][action[1]]
+            hand[action[2]] += 1
+            self._set_hand(p, tuple(hand))
+        self._check_winner(p)
+
+        if hashing:
+            self.hash ^= self._volatile_key() ^ dev_key(p, self.dev_vp[p], self.knight_cards[p], self.knights_played[p])
+
+    def _check_winner(self, p):
+        if self.winner is None and self.victory_points(p) >= 10: self.winner = p
+
+    def _settle(self, vid, p):
+        if self.hash is not None: self.hash ^= zobrist_key(PIECE, vid, p, 1)
+        self.vertex_owner[vid] = p
+        self.vertex_level[vid] = 1
+        self.settlement_count[p] += 1
+        self.buildings[p] = self.buildings[p] + (vid,)
+
+        port = self.tables.vertex_port[vid]
+        if port is not None:
+            ratios = self.ratios[p]
+            self.ratios[p] = tuple(2 if r == port else min(ratio, 3) if port == -1 else ratio
+                                   for r, ratio in enumerate(ratios))
+
+        if self.phase == 'SETUP':
+            self.setup_subphase = 'ROAD'
+            return
+        self._pay(p, SETTLEMENT_COST)
+
+        # A settlement can cut an opponent's road running through it.
+        for eid in self.tables.vertex_edges[vid]:
+            other = self.edge_owner[eid]
+            if other >= 0 and other != p and len(self.roads[other]) >= 5: self._update_road(other)
+
+    def _road(self, eid, p):
+        if self.hash is not None: self.hash ^= zobrist_key(ROAD, eid, p)
+        self.edge_owner[eid] = p
+        self.roads[p] = self.roads[p] + (eid,)
+        if self.phase == 'SETUP':
+            self._advance_setup(p)
+            return
+        self._pay(p, ROAD_COST)
+        if len(self.roads[p]) >= 5: self._update_road(p)
+
+    def _city(self, vid, p):
+        if self.hash is not None: self.hash ^= zobrist_key(PIECE, vid, p, 1) ^ zobrist_key(PIECE, vid, p, 2)
+        self.vertex_level[vid] = 2
+        self.settlement_count[p] -= 1
+        self.city_count[p] += 1
+        self._pay(p, CITY_COST)
+
+    def _advance_setup(self, p):
+        if self.setup_step >= len(self.setup_order) // 2:
+            tables = self.tables
+            hand = list(self.hands[p])
+            for t in tables.vertex_tiles[self.buildings[p][-1]]:
+                if tables.tile_resource[t] >= 0: hand[tables.tile_resource[t]] += 1
+            self._set_hand(p, tuple(hand))
+
+        self.setup_step += 1
+        if self.setup_step >= len(self.setup_order):
+            self.phase = 'MAIN'
+            self.current = 0
+            self.dice_rolled = False
+        else:
+            self.current = self.setup_order[self.setup_step]
+            self.setup_subphase = 'SETTLEMENT'
+
+    def _buy_dev_card(self, p, rng):
+        self._pay(p, DEV_CARD_COST)
+        deck = list(self.dev_deck)
+        pick = rng.randrange(sum(deck))
+        kind = 0 if pick < deck[0] else 1 if pick < deck[0] + deck[1] else 2
+        deck[kind] -= 1
+        self.dev_deck = tuple(deck)
+        if kind == 0: self.knight_cards[p] += 1
+        elif kind == 1: self.dev_vp[p] += 1
+
+    def play_knight(self, p, tile, rng):
+        self.knight_cards[p] -= 1
+        self.knights_played[p] += 1
+        self._move_robber(tile, p, rng)
+        knights = self.knights_played[p]
+        holder = self.army_holder
+        if knights >= 3 and holder != p and (holder < 0 or knights > self.knights_played[holder]):
+            self.army_holder = p
+        self._check_winner(p)
+
+    def _move_robber(self, tile, p, rng):
+        if self.hash is not None: self.hash ^= zobrist_key(ROBBER, self.robber) ^ zobrist_key(ROBBER, tile)
+        self.robber = tile
+        self.pending_robber = False
+        owner = self.vertex_owner
+        victims = []
+        for v in self.tables.tile_vertices[tile]:
+            o = owner[v]
+            if o >= 0 and o != p and o not in victims and sum(self.hands[o]): victims.append(o)
+        if not victims: return
+
+        victim = rng.choice(victims)
+        hand = self.hands[victim]
+        pick = rng.randrange(sum(hand))
+        for res, count in enumerate(hand):
+            if pick < count: break
+            pick -= count
+        self._gain(victim, res, -1)
+        self._gain(p, res)
+
+    def roll(self, rng):
+        d = rng.randint(1, 6) + rng.randint(1, 6)
+        self.dice_rolled = True
+        if d == 7:
+            self.pending_robber = True
+        else:
+            self.produce(d)
+        return d
+
+    def produce(self, roll):
+        tables = self.tables
+        owner, level = self.vertex_owner, self.vertex_level
+        gains = None
+        for t in tables.roll_tiles[roll]:
+            if t == self.robber: continue
+            res = tables.tile_resource[t]
+            for v in tables.tile_vertices[t]:
+                o = owner[v]
+                if o < 0: continue
+                if gains is None: gains = {}
+                hand = gains.get(o)
+                if hand is None: hand = gains[o] = list(self.hands[o])
+                hand[res] += level[v]
+        if gains:
+            for o, hand in gains.items(): self._set_hand(o, tuple(hand))
+
+    def _end_turn(self):
+        self.current = (self.current + 1) % self.num_players
+        self.dice_rolled = False
+        self.pending_robber = False
+        self.turn += 1
+
+    # --- longest road ---
+
+    def _update_road(self, p):
+        length = self._longest_trail(p)
+        self.road_length[p] = length
+        holder = self.road_holder
+        if holder == p:
+            if length < 5: self.road_holder = -1
+        elif length >= 5 and (holder < 0 or length > self.road_length[holder]):
+            self.road_holder = p
+
+    def _longest_trail(self, p):
+        ev, ve = self.tables.edge_vertices, self.tables.vertex_edges
+        edge_owner, owner = self.edge_owner, self.vertex_owner
+        best = 0
+        used = set()
+        reached = set()
+
+        def walk(v, length):
+            nonlocal best
+            if length > best: best = length
+            # An opponent building ends a trail but cannot be passed through.
+            if length and owner[v] >= 0 and owner[v] != p: return
+            for eid in ve[v]:
+                if eid in used or edge_owner[eid] != p: continue
+                used.add(eid)
+                reached.add(eid)
+                a, b = ev[eid]
+                walk(b if a == v else a, length + 1)
+                used.discard(eid)
+
+        # A longest trail never has to start at an open vertex in the middle of a road. A network without any
+        # other vertex is a closed loop: its edges are the ones no walk reached, and it is walked from any vertex.
+        degree = {}
+        for eid in self.roads[p]:
+            for v in ev[eid]: degree[v] = degree.get(v, 0) + 1
+        for v, d in degree.items():
+            if d != 2 or (owner[v] >= 0 and owner[v] != p): walk(v, 0)
+        for eid in self.roads[p]:
+            if eid not in reached: walk(ev[eid][0], 0)
+        return best
+
+    # --- rollouts ---
+
+    def _policy_setup(self, rng):
+        p = self.current
+        if self.setup_subphase == 'SETTLEMENT':
+            spots = self.settlement_spots(p)
+            scores = self.tables.vertex_score
+            sample = spots if len(spots) <= 5 else rng.sample(spots, 5)
+            self._settle(max(sample, key=lambda v: scores[v]), p)
+        else:
+            spots = self.road_spots(p)
+            if spots:
+                self._road(rng.choice(spots), p)
+            else:
+                self._advance_setup(p)
+
+    def _policy_robber(self, rng):
+        tiles = len(self.tables.tile_number)
+        tile = rng.randrange(tiles - 1)
+        if tile >= self.robber >= 0: tile += 1
+        self._move_robber(tile, self.current, rng)
+
+    def _policy_builds(self, p, rng):
+        # Mirrors the rule-based AI: the most valuable affordable build first, with a bank trade
+        # towards a city or settlement when a hand has piled up.
+        for _ in range(10):
+            if self.winner is not None: return
+            if self.can_afford(p, CITY_COST):
+                spots = self.city_spots(p)
+                if spots: self._city(rng.choice(spots), p); self._check_winner(p); continue
+            if self.can_afford(p, SETTLEMENT_COST):
+                spots = self.settlement_spots(p)
+                if spots:
+                    scores = self.tables.vertex_score
+                    self._settle(max(spots, key=lambda v: scores[v]), p)
+                    self._check_winner(p)
+                    continue
+            if self.can_afford(p, ROAD_COST) and not self.settlement_spots(p):
+                spots = self.road_spots(p)
+                if spots: self._road(rng.choice(spots), p); self._check_winner(p); continue
+            if not self._policy_trade(p): return
+
+    def _policy_trade(self, p):
+        hand, ratios = self.hands[p], self.ratios[p]
+        target = CITY_COST if self.city_spots(p) else SETTLEMENT_COST
+        missing = [r for r in range(5) if hand[r] < target[r]]
+        if not missing: return False
+        for give in range(5):
+            if hand[give] - target[give] >= ratios[give]:
+                hand = list(hand)
+                hand[give] -= ratios[give]
+                hand[missing[0]] += 1
+                self._set_hand(p, tuple(hand))
+                return True
+        return False
+
+    def play_turn(self, rng):
+        # Finishes the current player's turn with the rollout policy, from wherever it stands. Policy moves
+        # skip the incremental hash, so it is dropped.
+        self.hash = None
+        p = self.current
+        if not self.dice_rolled:
+            if self.knight_cards[p] and rng.random() < 0.3:
+                tiles = len(self.tables.tile_number)
+                tile = rng.randrange(tiles - 1)
+                if tile >= self.robber >= 0: tile += 1
+                self.play_knight(p, tile, rng)
+                if self.winner is not None: return
+            self.roll(rng)
+        if self.pending_robber: self._policy_robber(rng)
+        self._policy_builds(p, rng)
+        self._check_winner(p)
+        if self.winner is None: self._end_turn()
+
+    def rollout(self, rng, max_turns):
+        self.hash = None
+        end = self.turn + max_turns
+        while self.winner is None and self.turn < end:
+            if self.phase == 'SETUP':
+                self._policy_setup(rng)
+            else:
+                self.play_turn(rng)
+
+    def score(self, p):
+        # 1 for a win; otherwise the VP lead over the best opponent, squashed into (0, 1).
+        if self.winner is not None: return 1.0 if self.winner == p else 0.0
+        mine = self.victory_points(p)
+        best_other = max(self.victory_points(o) for o in range(self.num_players) if o != p)
+        return min(max(0.5 + (mine - best_other) / 20, 0.05), 0.95)
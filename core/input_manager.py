@@ -1,22 +1,25 @@
 import pygame
-import sys
-import random
 
 
 class InputManager:
     def __init__(self, game):
         self.game = game
 
-    def handle_input(self):
+    def handle_input(self, events):
         player = self.game.get_current_player()
 
         if player.is_ai:
-            for event in pygame.event.get():
+            # AI turns run in the frame loop, so the window can still be closed, saved or loaded meanwhile.
+            for event in events:
                 if event.type == pygame.QUIT:
                     self.game.running = False
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_s:
+                    self.game.storage_manager.save_game()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_l:
+                    self.game.storage_manager.load_game()
             return
 
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 self.game.running = False
 
@@ -33,49 +36,41 @@ class InputManager:
             hovered_vertex = None
             hovered_edge = None
 
-            for tile in self.game.board.tiles:
-                if self.game.setup_subphase == 'SETTLEMENT':
-                    v = tile.get_nearest_vertex(mx, my)
-                    if v: hovered_vertex = v
-                elif self.game.setup_subphase == 'ROAD':
-                    e = tile.get_nearest_edge(mx, my)
-                    if e: hovered_edge = e
+            if self.game.setup_subphase == 'SETTLEMENT':
+                hovered_vertex = self.game.board.get_nearest_vertex(mx, my)
+            elif self.game.setup_subphase == 'ROAD':
+                hovered_edge = self.game.board.get_nearest_edge(mx, my)
 
-            if self.game.setup_subphase == 'SETTLEMENT' and hovered_vertex:
+            if self.game.setup_subphase == 'SETTLEMENT' and hovered_vertex is not None:
                 if self.game.board.place_settlement(hovered_vertex, player, initial_phase=True):
                     self.game.rules_manager.advance_setup_step()
-            elif self.game.setup_subphase == 'ROAD' and hovered_edge:
+            elif self.game.setup_subphase == 'ROAD' and hovered_edge is not None:
                 if self.game.board.place_road(hovered_edge, player):
                     self.game.rules_manager.advance_setup_step()
 
         elif self.game.game_phase == 'MAIN':
-            hovered_vertex = None
-            hovered_edge = None
-            selected_hex = None
-            for tile in self.game.board.tiles:
-                if tile.contains_point(mx, my): selected_hex = tile
-                v = tile.get_nearest_vertex(mx, my);
-                if v: hovered_vertex = v
-                e = tile.get_nearest_edge(mx, my);
-                if e: hovered_edge = e
+            selected_hex = self.game.board.get_tile_at(mx, my)
+            hovered_vertex = self.game.board.get_nearest_vertex(mx, my)
+            hovered_edge = self.game.board.get_nearest_edge(mx, my)
 
             if self.game.interaction_mode == 'move_robber' and selected_hex:
                 self.game.board.move_robber(selected_hex)
                 self.game.interaction_mode = 'view'
                 self.game.rules_manager.execute_robber_theft(selected_hex)
 
-            elif self.game.interaction_mode == 'build_settlement' and hovered_vertex:
+            elif self.game.interaction_mode == 'build_settlement' and hovered_vertex is not None:
                 if player.can_afford('settlement'):
                     if self.game.board.place_settlement(hovered_vertex, player):
                         player.deduct_resources('settlement')
+                        self.game.rules_manager.check_achievements()
 
-            elif self.game.interaction_mode == 'build_road' and hovered_edge:
+            elif self.game.interaction_mode == 'build_road' and hovered_edge is not None:
                 if player.can_afford('road'):
                     if self.game.board.place_road(hovered_edge, player):
                         player.deduct_resources('road')
                         self.game.rules_manager.check_achievements()
 
-            elif self.game.interaction_mode == 'build_city' and hovered_vertex:
+            elif self.game.interaction_mode == 'build_city' and hovered_vertex is not None:
                 if player.can_afford('city'):
                     if self.game.board.upgrade_to_city(hovered_vertex, player):
                         player.deduct_resources('city')
@@ -100,19 +95,10 @@ class InputManager:
                 else:
                     self.game.p2p_active_side = 'give'
 
-            elif event.key == pygame.K_SPACE:
-                start_idx = self.game.p2p_target_idx
-                while True:
-                    self.game.p2p_target_idx = (self.game.p2p_target_idx + 1) % len(self.game.players)
-                    if self.game.p2p_target_idx != self.game.current_player_idx:
-                        break
-                    if self.game.p2p_target_idx == start_idx: break
-
             elif event.key in [pygame.K_w, pygame.K_b, pygame.K_s, pygame.K_g, pygame.K_o]:
                 self._handle_p2p_selection(event.key)
 
             elif event.key == pygame.K_RETURN:
-                target_player = self.game.players[self.game.p2p_target_idx]
                 give = self.game.p2p_offer['give']
                 get = self.game.p2p_offer['get']
 
@@ -125,23 +111,27 @@ class InputManager:
                 elif not give and not get:
                     self.game.set_message("Empty offer!", 1000)
                 else:
-                    if target_player.is_ai:
-                        accepted, msg = self.game.ai_brain.evaluate_trade_offer_specific(target_player, give, get)
-                        if accepted:
-                            self.game.rules_manager.execute_p2p_trade(player, target_player, give, get)
-                            self.game.interaction_mode = 'view'
-                            self._reset_p2p()
-                        else:
-                            self.game.set_message(f"{target_player.name} refused.", 2000)
+                    # Every other player answers at once: AIs accept or counter, humans are listed to be asked.
+                    self.game.p2p_responses = self.game.trade_engine.evaluate_offer(player, give, get)
+                    if self.game.p2p_responses:
+                        self.game.interaction_mode = 'p2p_responses'
                     else:
-                        target_valid = True
-                        for res, amt in get.items():
-                            if target_player.resources.get(res, 0) < amt: target_valid = False
-
-                        if not target_valid:
-                            self.game.set_message(f"{target_player.name} can't afford this!", 2000)
-                        else:
-                            self.game.interaction_mode = 'p2p_confirm'
+                        self.game.set_message("Nobody accepts this trade.", 2000)
+            return
+
+        if self.game.interaction_mode == 'p2p_responses':
+            choice = event.key - pygame.K_1
+            if event.key == pygame.K_ESCAPE:
+                self.game.interaction_mode = 'p2p_trade'
+            elif 0 <= choice < min(len(self.game.p2p_responses), 9):
+                response = self.game.p2p_responses[choice]
+                if response.kind == 'ask':
+                    self.game.p2p_target_idx = self.game.players.index(response.partner)
+                    self.game.interaction_mode = 'p2p_confirm'
+                else:
+                    self.game.trade_engine.execute(player, response)
+                    self.game.interaction_mode = 'view'
+                    self._reset_p2p()
             return
 
         if self.game.interaction_mode == 'p2p_confirm':
@@ -188,26 +178,19 @@ class InputManager:
         elif event.key == pygame.K_p:
             self.game.interaction_mode = 'p2p_trade'
             self._reset_p2p()
-            self.game.p2p_target_idx = (self.game.current_player_idx + 1) % len(self.game.players)
 
         elif event.key == pygame.K_r:
             if not self.game.dice_rolled_this_turn:
-                d = random.randint(1, 6) + random.randint(1, 6)
-                self.game.last_dice_roll = d
-                self.game.dice_rolled_this_turn = True
+                d = self.game.roll_dice()
                 self.game.set_message(f"{player.name} Rolled: {d}", 1500)
 
                 if d == 7:
                     self.game.interaction_mode = 'move_robber'
                     self.game.set_message("ROBBER! Click a hex.", 3000)
-                else:
-                    self.game.board.distribute_resources(d)
 
         elif event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
             if self.game.dice_rolled_this_turn:
-                self.game.current_player_idx = (self.game.current_player_idx + 1) % len(self.game.players)
-                self.game.dice_rolled_this_turn = False
-                self.game.last_dice_roll = 0
+                self.game.end_turn()
 
     def _handle_special_keys(self, key, player):
         res_map = {pygame.K_w: 'wood', pygame.K_b: 'brick', pygame.K_s: 'sheep', pygame.K_g: 'wheat', pygame.K_o: 'ore'}
@@ -252,4 +235,5 @@ class InputManager:
 
     def _reset_p2p(self):
         self.game.p2p_offer = {'give': {}, 'get': {}}
-        self.game.p2p_active_side = 'give'
\ No newline at end of file
+        self.game.p2p_active_side = 'give'
+        self.game.p2p_responses = []
\ No newline at end of file
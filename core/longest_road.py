@@ -0,0 +1,106 @@
+class LongestRoadEngine:
+    # Caches every player's connected road networks and their longest trail. A new road only merges
+    # the networks it touches, and a new settlement only splits the opponent networks running through it.
+    def __init__(self, board):
+        self.board = board
+        self.components = {}
+        self.component_owner = {}
+        self.component_length = {}
+        self.edge_component = {}
+        self.player_components = {}
+        self.lengths = {}
+        self._next_id = 0
+
+        for eid, player in list(board.built_roads.items()):
+            self.on_road(eid, player)
+
+    def get_length(self, player):
+        return self.lengths.get(player, 0)
+
+    def _is_blocked(self, vertex_id, player):
+        owner = self.board.get_building_owner(vertex_id)
+        return owner is not None and owner != player
+
+    def _linked_edges(self, edge_id, player):
+        for vid in self.board.edge_vertices[edge_id]:
+            if self._is_blocked(vid, player): continue
+            for other in self.board.vertex_edges[vid]:
+                if other != edge_id and self.board.built_roads.get(other) == player:
+                    yield other
+
+    def _add_component(self, player, edges):
+        cid = self._next_id
+        self._next_id += 1
+        self.components[cid] = edges
+        self.component_owner[cid] = player
+        self.component_length[cid] = self._longest_trail(edges, player)
+        self.player_components.setdefault(player, set()).add(cid)
+        for eid in edges:
+            self.edge_component[eid] = cid
+
+    def _remove_component(self, cid):
+        player = self.component_owner.pop(cid)
+        self.component_length.pop(cid)
+        self.player_components[player].discard(cid)
+        return self.components.pop(cid)
+
+    def _refresh_player(self, player):
+        self.lengths[player] = max((self.component_length[cid] for cid in self.player_components.get(player, ())),
+                                   default=0)
+
+    def _longest_trail(self, edges, player):
+        adj = {}
+        for eid in edges:
+            v1, v2 = self.board.edge_vertices[eid]
+            adj.setdefault(v1, []).append((v2, eid))
+            adj.setdefault(v2, []).append((v1, eid))
+
+        blocked = {vid for vid in adj if self._is_blocked(vid, player)}
+        max_len = 0
+
+        def dfs(curr, visited, length):
+            nonlocal max_len
+            if length > max_len: max_len = length
+            # A trail may end on an opponent's building but cannot run through it.
+            if length and curr in blocked: return
+            for neigh, eid in adj[curr]:
+                if eid not in visited:
+                    visited.add(eid)
+                    dfs(neigh, visited, length + 1)
+                    visited.remove(eid)
+
+        is_loop = all(len(links) == 2 for links in adj.values())
+        for start in adj:
+            # A trail starting at an open degree-2 vertex can always be extended backwards, unless
+            # the whole network is a single loop.
+            if len(adj[start]) == 2 and start not in blocked and not is_loop: continue
+            dfs(start, set(), 0)
+        return max_len
+
+    def on_road(self, edge_id, player):
+        edges = {edge_id}
+        linked = {self.edge_component[e] for e in self._linked_edges(edge_id, player) if e in self.edge_component}
+        for cid in linked:
+            edges |= self._remove_component(cid)
+        self._add_component(player, edges)
+        self._refresh_player(player)
+
+    def on_settlement(self, vertex_id, player):
+        cut = {self.edge_component[eid] for eid in self.board.vertex_edges[vertex_id]
+               if eid in self.board.built_roads and self.board.built_roads[eid] != player}
+
+        for cid in cut:
+            owner = self.component_owner[cid]
+            remaining = self._remove_component(cid)
+            while remaining:
+                start = remaining.pop()
+                part = {start}
+                stack = [start]
+                while stack:
+                    for other in self._linked_edges(stack.pop(), owner):
+                        if other in remaining:
+                            remaining.discard(other)
+                            part.add(other)
+                            stack.append(other)
+                self._add_component(owner, part)
+            self._refresh_player(owner)
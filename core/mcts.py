@@ -0,0 +1,187 @@
+import heapq
+import math
+import random
+import time
+
+from core.zobrist import zobrist_key, PERSPECTIVE
+
+
+def run_to_end(gen):
+    # Drives a generator that only yields pauses and returns its result.
+    while True:
+        try:
+            next(gen)
+        except StopIteration as stop:
+            return stop.value
+
+
+class MCTSNode:
+    __slots__ = ('parent', 'action', 'children', 'visits', 'value')
+
+    def __init__(self, parent=None, action=None):
+        self.parent = parent
+        self.action = action
+        self.children = {}
+        self.visits = 0
+        self.value = 0.0
+
+
+class MCTS:
+    # Open-loop UCT over the current player's own decisions. The tree stops where control passes to
+    # another player; from there a policy rollout plays the game out, so dice and steals are resampled
+    # on every iteration instead of being stored in the tree.
+    # With a transposition table, rollout results are stored under the leaf's Zobrist hash; a leaf that
+    # already has table_min_visits results, from another branch or an earlier decision, reuses their mean.
+    # Setup settlements are searched among the setup_candidates best-scored vertices only: spread over
+    # every free vertex, a few hundred iterations leave each one too few visits to tell them apart.
+    def __init__(self, iterations=500, time_budget=None, exploration=0.7, rollout_turns=40, table=None,
+                 table_min_visits=8, setup_candidates=8):
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.rollout_turns = rollout_turns
+        self.table = table
+        self.table_min_visits = table_min_visits
+        self.setup_candidates = setup_candidates
+
+        self.last_iterations = 0
+        self.last_seconds = 0.0
+
+    def choose(self, state, rng, budget=None):
+        return run_to_end(self.iter_choose(state, rng, budget=budget))
+
+    def search(self, state, rng, root=None):
+        return run_to_end(self.iter_search(state, rng, root))
+
+    def iter_choose(self, state, rng, slice_seconds=None, budget=None):
+        # Anytime: whatever the budget, a move is returned. When the search ran out of time before trying
+        # anything, the quick heuristic move stands in.
+        actions = self._actions(state)
+        if len(actions) <= 1:
+            self.last_iterations, self.last_seconds = 0, 0.0
+            return actions[0] if actions else None
+
+        root = yield from self.iter_search(state, rng, slice_seconds=slice_seconds, budget=budget)
+        if not root.children: return state.quick_action()
+        return max(root.children.values(), key=lambda child: child.visits).action
+
+    def _actions(self, state):
+        actions = state.legal_actions()
+        if state.phase == 'SETUP' and state.setup_subphase == 'SETTLEMENT' and len(actions) > self.setup_candidates:
+            scores = state.placement_scores(state.current, [action[1] for action in actions])
+            actions = heapq.nlargest(self.setup_candidates, actions, key=lambda action: scores[action[1]])
+        return actions
+
+    def _time_limit(self, budget):
+        limits = [b for b in (self.time_budget, budget) if b is not None]
+        return min(limits) if limits else None
+
+    def iter_search(self, state, rng, root=None, slice_seconds=None, budget=None):
+        # Generator form of search(): with slice_seconds it yields 0 after every slice of work, so a
+        # caller running a frame loop can keep drawing while the tree grows. budget (seconds) tightens
+        # the search's own time_budget for this call.
+        root = root or MCTSNode()
+        player = state.current
+        if self.table is not None: self.table.new_search()
+        start = time.perf_counter()
+        limit = self._time_limit(budget)
+        deadline = None if limit is None else start + limit
+        slice_end = None if slice_seconds is None else start + slice_seconds
+
+        done = 0
+        while done < self.iterations:
+            now = time.perf_counter()
+            if deadline is not None and now >= deadline: break
+            if slice_end is not None and now >= slice_end:
+                yield 0
+                slice_end = time.perf_counter() + slice_seconds
+            self._iterate(root, state.clone(), player, rng)
+            done += 1
+
+        self.last_iterations = done
+        self.last_seconds = time.perf_counter() - start
+        return root
+
+    def _iterate(self, root, state, player, rng):
+        node = root
+        while state.current == player and state.is_decision():
+            legal = self._actions(state)
+            untried = [a for a in legal if a not in node.children]
+            if untried:
+                action = rng.choice(untried)
+                child = MCTSNode(node, action)
+                node.children[action] = child
+                state.apply(action, rng)
+                node = child
+                break
+            node = self._select(node, legal)
+            state.apply(node.action, rng)
+
+        reward = self._evaluate(state, player, rng)
+        while node is not None:
+            node.visits += 1
+            node.value += reward
+            node = node.parent
+
+    def _evaluate(self, state, player, rng):
+        if self.table is None or state.hash is None:
+            state.rollout(rng, self.rollout_turns)
+            return state.score(player)
+
+        key = state.hash ^ zobrist_key(PERSPECTIVE, player)
+        entry = self.table.get(key)
+        if entry and entry[0] >= self.table_min_visits: return entry[1] / entry[0]
+        state.rollout(rng, self.rollout_turns)
+        reward = state.score(player)
+        self.table.add(key, 1, reward)
+        return reward
+
+    def _select(self, node, legal):
+        log_n = math.log(node.visits)
+        c = self.exploration
+        best, best_score = None, -1.0
+        for action in legal:
+            child = node.children[action]
+            score = child.value / child.visits + c * math.sqrt(log_n / child.visits)
+            if score > best_score: best, best_score = child, score
+        return best
+
+
+def _search_worker(args):
+    iterations, time_budget, exploration, rollout_turns, state, seed = args
+    search = MCTS(iterations, time_budget, exploration, rollout_turns)
+    root = search.search(state, random.Random(seed))
+    return {action: (child.visits, child.value) for action, child in root.children.items()}, search.last_iterations
+
+
+class ParallelMCTS(MCTS):
+    # Root parallelization: every worker of the pool grows its own tree from the same state with its own
+    # seed, and the root statistics are summed before choosing. The iteration budget is split between
+    # the workers; a time budget applies to each of them.
+    def __init__(self, pool, workers, iterations=500, time_budget=None, exploration=0.7, rollout_turns=40):
+        super().__init__(iterations, time_budget, exploration, rollout_turns)
+        self.pool = pool
+        self.workers = workers
+
+    def iter_search(self, state, rng, root=None, slice_seconds=None, budget=None):
+        root = root or MCTSNode()
+        start = time.perf_counter()
+        share = self.iterations if self.iterations == float('inf') else math.ceil(self.iterations / self.workers)
+        jobs = [(share, self._time_limit(budget), self.exploration, self.rollout_turns, state, rng.getrandbits(64))
+                for _ in range(self.workers)]
+
+        pending = self.pool.map_async(_search_worker, jobs)
+        while slice_seconds is not None and not pending.ready():
+            yield 0
+
+        self.last_iterations = 0
+        for stats, done in pending.get():
+            self.last_iterations += done
+            for action, (visits, value) in stats.items():
+                child = root.children.get(action)
+                if child is None: child = root.children[action] = MCTSNode(root, action)
+                child.visits += visits
+                child.value += value
+                root.visits += visits
+        self.last_seconds = time.perf_counter() - start
+        return root
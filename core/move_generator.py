@@ -0,0 +1,86 @@
+class MoveGenerator:
+    # Keeps the legal settlement vertices, road edges and city upgrades of every player up to date
+    # as pieces are placed, so the AI and the UI never have to probe the board to find them.
+    def __init__(self, board):
+        self.board = board
+        self.free_vertices = set(range(len(board.vertex_positions)))
+        for vid in list(board.built_settlements) + list(board.built_cities):
+            self._block_vertex(vid)
+
+        self.road_vertices = {}
+        self.settlement_spots = {}
+        self.road_spots = {}
+        self.city_spots = {}
+
+    def _block_vertex(self, vertex_id):
+        self.free_vertices.discard(vertex_id)
+        for neigh in self.board.vertex_neighbors[vertex_id]:
+            self.free_vertices.discard(neigh)
+
+    def _ensure_player(self, player):
+        if player in self.road_spots: return
+
+        self.road_vertices[player] = set()
+        self.settlement_spots[player] = set()
+        self.road_spots[player] = set()
+        self.city_spots[player] = {vid for vid, owner in self.board.built_settlements.items() if owner == player}
+
+        for eid, owner in self.board.built_roads.items():
+            if owner == player:
+                for vid in self.board.edge_vertices[eid]: self._add_reach(vid, player)
+        for vid, owner in list(self.board.built_settlements.items()) + list(self.board.built_cities.items()):
+            if owner == player: self._open_edges(vid, player)
+
+    def _open_edges(self, vertex_id, player):
+        for eid in self.board.vertex_edges[vertex_id]:
+            if eid not in self.board.built_roads: self.road_spots[player].add(eid)
+
+    def _add_reach(self, vertex_id, player):
+        self.road_vertices[player].add(vertex_id)
+        if vertex_id in self.free_vertices: self.settlement_spots[player].add(vertex_id)
+        self._open_edges(vertex_id, player)
+
+    def on_settlement(self, vertex_id, player):
+        self._ensure_player(player)
+        self._block_vertex(vertex_id)
+
+        blocked = (vertex_id,) + self.board.vertex_neighbors[vertex_id]
+        for spots in self.settlement_spots.values():
+            spots.difference_update(blocked)
+
+        self.city_spots[player].add(vertex_id)
+        self._open_edges(vertex_id, player)
+
+    def on_road(self, edge_id, player):
+        self._ensure_player(player)
+        for spots in self.road_spots.values():
+            spots.discard(edge_id)
+
+        for vid in self.board.edge_vertices[edge_id]:
+            self._add_reach(vid, player)
+
+    def on_city(self, vertex_id, player):
+        self._ensure_player(player)
+        self.city_spots[player].discard(vertex_id)
+
+    def can_settle(self, vertex_id, player, initial_phase=False):
+        if initial_phase: return vertex_id in self.free_vertices
+        self._ensure_player(player)
+        return vertex_id in self.settlement_spots[player]
+
+    def can_build_road(self, edge_id, player):
+        self._ensure_player(player)
+        return edge_id in self.road_spots[player]
+
+    def get_settlement_spots(self, player, initial_phase=False):
+        if initial_phase: return sorted(self.free_vertices)
+        self._ensure_player(player)
+        return sorted(self.settlement_spots[player])
+
+    def get_road_spots(self, player):
+        self._ensure_player(player)
+        return sorted(self.road_spots[player])
+
+    def get_city_spots(self, player):
+        self._ensure_player(player)
+        return sorted(self.city_spots[player])
@@ -10,6 +10,9 @@ class Player:
         self.resources = {
             'wood': 0, 'brick': 0, 'sheep': 0, 'wheat': 0, 'ore': 0
         }
+        self.resources_produced = {
+            'wood': 0, 'brick': 0, 'sheep': 0, 'wheat': 0, 'ore': 0
+        }
 
         self.trade_ratios = {
             'wood': 4, 'brick': 4, 'sheep': 4, 'wheat': 4, 'ore': 4
@@ -1,6 +1,3 @@
-import random
-
-
 class RulesManager:
     def __init__(self, game):
         self.game = game
@@ -49,7 +46,7 @@ class RulesManager:
                 player.knights_played += 1
                 valid_tiles = [t for t in self.game.board.tiles if not t.has_robber]
                 if valid_tiles:
-                    target = random.choice(valid_tiles)
+                    target = self.game.rng.choice(valid_tiles)
                     self.game.board.move_robber(target)
                     self.execute_robber_theft(target)
                 self.check_achievements()
@@ -112,12 +109,12 @@ class RulesManager:
             self.game.set_message("Robber moved. No one to steal from!", 2000)
             return
 
-        victim = random.choice(valid_victims)
+        victim = self.game.rng.choice(valid_victims)
         victim_hand = []
         for res, count in victim.resources.items():
             victim_hand.extend([res] * count)
 
-        stolen_res = random.choice(victim_hand)
+        stolen_res = self.game.rng.choice(victim_hand)
         victim.resources[stolen_res] -= 1
         current_player.resources[stolen_res] += 1
 
@@ -0,0 +1,33 @@
+import time
+
+import config
+from core.game_engine import GameEngine
+from core.mcts import MCTS
+from core.player import Player
+from core.zobrist import TranspositionTable
+
+AI_COLORS = [color for _, color in config.PLAYER_COLORS]
+
+
+def play_game(seed, num_players=4, max_turns=1000, board_pool=None, radius=2, mcts_players=0, mcts_iterations=200,
+              decision_budget=None, turn_budget=None, player_trades=True):
+    # The first mcts_players seats search their moves, the rest play the rule-based AI.
+    # mcts_iterations=0 leaves the search limited by the time budgets only.
+    players = [Player(f"{'MCTS' if i < mcts_players else 'AI'} {i + 1}", AI_COLORS[i % len(AI_COLORS)], is_ai=True)
+               for i in range(num_players)]
+    searches = {i: MCTS(mcts_iterations or float('inf'), table=TranspositionTable()) for i in range(mcts_players)}
+
+    start = time.perf_counter()
+    game = GameEngine(players, seed=seed, board_pool=board_pool, radius=radius, searches=searches,
+                      decision_budget=decision_budget, turn_budget=turn_budget, player_trades=player_trades)
+    game.run(max_turns=max_turns)
+
+    return {
+        'seed': seed,
+        'winner': game.winner,
+        'turns': game.turn_count,
+        'victory_points': {p.name: p.update_victory_points() for p in players},
+        'resources_produced': {p.name: sum(p.resources_produced.values()) for p in players},
+        'player_trades': game.trade_engine.trades,
+        'seconds': round(time.perf_counter() - start, 4),
+    }
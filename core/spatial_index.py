@@ -0,0 +1,23 @@
+class SpatialIndex:
+    # Buckets points into a uniform grid so a nearest-point query only looks at the cells around the cursor.
+    def __init__(self, points, cell_size=15):
+        self.cell_size = cell_size
+        self.cells = {}
+        for item, (x, y) in points:
+            key = (int(x // cell_size), int(y // cell_size))
+            self.cells.setdefault(key, []).append((item, x, y))
+
+    def nearest(self, x, y, max_dist):
+        reach = int(max_dist // self.cell_size) + 1
+        cx, cy = int(x // self.cell_size), int(y // self.cell_size)
+
+        best = None
+        best_dist = max_dist * max_dist
+        for i in range(cx - reach, cx + reach + 1):
+            for j in range(cy - reach, cy + reach + 1):
+                for item, px, py in self.cells.get((i, j), ()):
+                    dist = (x - px) ** 2 + (y - py) ** 2
+                    if dist < best_dist:
+                        best_dist = dist
+                        best = item
+        return best
@@ -12,7 +12,8 @@ class StorageManager:
             'players': self.game.players,
             'idx': self.game.current_player_idx,
             'turn': self.game.dice_rolled_this_turn,
-            'phase': self.game.game_phase
+            'phase': self.game.game_phase,
+            'rng': self.game.rng
         }
         try:
             with open(filename, "wb") as f:
@@ -29,13 +30,23 @@ class StorageManager:
 
         try:
             with open(filename, "rb") as f:
-                data = pickle.load(f)
+                try:
+                    data = pickle.load(f)
+                except (AttributeError, TypeError):
+                    # Classes that have since gained __slots__ cannot take the pickled attributes back.
+                    data = None
+
+            if data is None or not getattr(data['board'], 'vertex_positions', None):
+                self.game.set_message("Save file is from an older version!", 2000)
+                return
 
             self.game.board = data['board']
             self.game.players = data['players']
             self.game.current_player_idx = data['idx']
             self.game.dice_rolled_this_turn = data['turn']
             self.game.game_phase = data.get('phase', 'MAIN')
+            self.game.rng = data.get('rng', self.game.rng)
+            self.game.board.rng = self.game.rng
 
             self.game.reinit_controllers()
 
@@ -0,0 +1,166 @@
+from core.board_generator import PIPS
+from core.game_state import RESOURCES, ROAD_COST, SETTLEMENT_COST, CITY_COST, DEV_CARD_COST
+
+CARD_VALUE = 0.3  # a card no goal needs is still worth this much divided by the bank ratio
+ACCEPT_MARGIN = 0.05  # smallest gain a player trades for
+LEADER_VP = 8  # nobody trades with a player this close to winning
+MAX_CARDS = 10  # need table length per resource; further cards are valued as surplus
+OFFER_CANDIDATES = 4  # own offers an AI puts to the table per turn
+
+
+class TradeResponse:
+    # One partner's answer to an offer. give and get are seen from the proposer: what the proposer hands
+    # over and what they receive. kind is 'accept' for the offer as made, 'counter' for a changed offer
+    # and 'ask' for a human partner, who has to be asked in person.
+    def __init__(self, partner, kind, give, get, proposer_value, partner_value=None):
+        self.partner = partner
+        self.kind = kind
+        self.give = give
+        self.get = get
+        self.proposer_value = proposer_value
+        self.partner_value = partner_value
+
+
+class TradeEngine:
+    # Player to player trades. Every player's needs are kept as a table of what each further card of a
+    # resource is worth to them, built from the goals they can work towards and how rarely they produce
+    # the resource, and rebuilt only when their buildings or ports change. With it an offer is weighed
+    # against every partner in one call, and AIs can answer with counter-offers or make offers themselves.
+    def __init__(self, game):
+        self.game = game
+        self._needs = {}
+        self.trades = 0
+
+    def refresh(self):
+        # Brings the need tables up to date; called once per offer or turn, not per valuation.
+        board = self.game.board
+        for player in self.game.players:
+            key = (len(player.settlements), len(player.cities), len(player.roads), len(board.built_settlements),
+                   len(board.built_roads), bool(board.dev_card_deck), tuple(player.trade_ratios.values()),
+                   player.general_port_ratio)
+            cached = self._needs.get(player)
+            if not cached or cached[0] != key: self._needs[player] = (key, self._build_needs(player))
+
+    def _build_needs(self, player):
+        board = self.game.board
+        spots = board.get_all_possible_settlement_spots(player)
+        goals = [(ROAD_COST, 0.3 if spots else 0.8)]
+        if spots: goals.append((SETTLEMENT_COST, 1.0))
+        if player.settlements: goals.append((CITY_COST, 1.2))
+        if board.dev_card_deck: goals.append((DEV_CARD_COST, 0.4))
+
+        pips = dict.fromkeys(RESOURCES, 0)
+        for vid, count in [(v, 1) for v in player.settlements] + [(v, 2) for v in player.cities]:
+            for tile in board.vertex_tiles[vid]:
+                if tile.number_token is not None: pips[tile.resource_type] += PIPS[tile.number_token] * count
+
+        table = {}
+        for i, res in enumerate(RESOURCES):
+            surplus = CARD_VALUE / min(player.trade_ratios[res], player.general_port_ratio)
+            scarcity = 1 + 2 / (2 + pips[res])
+            values = [surplus] * MAX_CARDS
+            for cost, weight in goals:
+                for k in range(cost[i]): values[k] += weight / sum(cost) * scarcity
+            table[res] = (values, surplus)
+        return table
+
+    def trade_value(self, player, receive, give):
+        # What a trade is worth to the player by their needs, or None when they cannot pay their side.
+        table = self._needs[player][1]
+        value = 0.0
+        for res, amt in give.items():
+            have = player.resources[res]
+            if have < amt: return None
+            values, surplus = table[res]
+            value -= sum(values[k] if k < MAX_CARDS else surplus for k in range(have - amt, have))
+        for res, amt in receive.items():
+            have = player.resources[res]
+            values, surplus = table[res]
+            value += sum(values[k] if k < MAX_CARDS else surplus for k in range(have, have + amt))
+        return value
+
+    def _leading(self, player):
+        return player.update_victory_points() >= LEADER_VP
+
+    def evaluate_offer(self, proposer, give, get, partners=None):
+        # Puts the offer to every other player (or just partners) and returns every acceptance, counter-offer
+        # and human partner able to pay, best for the proposer first.
+        if partners is None: partners = [p for p in self.game.players if p is not proposer]
+        self.refresh()
+        proposer_leading = self._leading(proposer)
+
+        responses = []
+        for partner in partners:
+            if any(partner.resources[res] < amt for res, amt in get.items()): continue
+            if not partner.is_ai:
+                responses.append(TradeResponse(partner, 'ask', give, get, self.trade_value(proposer, get, give)))
+                continue
+            if proposer_leading: continue
+
+            value = self.trade_value(partner, give, get)
+            if value is not None and value >= ACCEPT_MARGIN:
+                responses.append(TradeResponse(partner, 'accept', give, get, self.trade_value(proposer, get, give),
+                                               value))
+                continue
+            counter = self.counter_offer(partner, proposer, give, get)
+            if counter: responses.append(counter)
+
+        order = {'accept': 0, 'counter': 1, 'ask': 2}
+        responses.sort(key=lambda r: (order[r.kind], -(r.proposer_value or 0.0), -(r.partner_value or 0.0)))
+        return responses
+
+    def counter_offer(self, partner, proposer, give, get):
+        # The smallest change to the offer that the partner would accept: one card less from the partner,
+        # or one more card of something the proposer holds. The one the partner gains most from wins;
+        # counters that would turn the trade into a gift are left out.
+        candidates = []
+        for res, amt in get.items():
+            changed = dict(get)
+            if amt > 1: changed[res] = amt - 1
+            else: del changed[res]
+            if changed: candidates.append((give, changed))
+        for res in RESOURCES:
+            if res in get or proposer.resources[res] <= give.get(res, 0): continue
+            changed = dict(give)
+            changed[res] = changed.get(res, 0) + 1
+            candidates.append((changed, get))
+
+        best, best_value = None, ACCEPT_MARGIN
+        for new_give, new_get in candidates:
+            value = self.trade_value(partner, new_give, new_get)
+            if value is not None and value >= best_value: best, best_value = (new_give, new_get), value
+        if best is None: return None
+        return TradeResponse(partner, 'counter', best[0], best[1], self.trade_value(proposer, best[1], best[0]),
+                             best_value)
+
+    def _offers(self, player):
+        # The player's own offers worth making, best first: one or two of a card they can spare for one
+        # card they need.
+        table = self._needs[player][1]
+        offers = []
+        for want in RESOURCES:
+            if table[want][0][min(player.resources[want], MAX_CARDS - 1)] <= table[want][1]: continue
+            for spare in RESOURCES:
+                if spare == want: continue
+                for amt in (1, 2):
+                    value = self.trade_value(player, {want: 1}, {spare: amt})
+                    if value is not None and value >= ACCEPT_MARGIN: offers.append((value, {spare: amt}, {want: 1}))
+        offers.sort(key=lambda offer: -offer[0])
+        return [(give, get) for _, give, get in offers[:OFFER_CANDIDATES]]
+
+    def best_trade(self, player):
+        # The best trade another AI agrees to, taking counter-offers the player still gains from, or None.
+        if self._leading(player): return None
+        partners = [p for p in self.game.players if p is not player and p.is_ai]
+        if not partners: return None
+
+        self.refresh()
+        for give, get in self._offers(player):
+            for response in self.evaluate_offer(player, give, get, partners):
+                if response.proposer_value is not None and response.proposer_value >= ACCEPT_MARGIN:
+                    return response
+        return None
+
+    def execute(self, proposer, response):
+        self.game.rules_manager.execute_p2p_trade(proposer, response.partner, response.give, response.get)
+        self.trades += 1
@@ -0,0 +1,77 @@
+import heapq
+
+from core.board_generator import PIPS
+
+DIVERSITY_BONUS = 1.0  # per resource beyond the first
+PORT_BONUS = {'3:1': 1.0}
+SPECIAL_PORT_BONUS = 1.5  # 2:1 port
+MISSING_RESOURCE_BONUS = 2.0  # per resource the player does not produce yet
+
+
+class VertexValues:
+    # Placement score of every vertex: pips of the producing tiles around it weighted by how scarce their
+    # resource is on this board, plus bonuses for resource diversity and ports. Built once per board and
+    # adjusted only for the vertices a robber move or a new settlement touches.
+    def __init__(self, board):
+        self.board = board
+
+        totals = {}
+        for tile in board.tiles:
+            if tile.number_token is not None:
+                totals[tile.resource_type] = totals.get(tile.resource_type, 0) + PIPS[tile.number_token]
+        mean = sum(totals.values()) / len(totals) if totals else 0
+        self.scarcity = {res: min(max(mean / pips, 0.5), 2.0) for res, pips in totals.items()}
+
+        self.scores = [self._score(vid) for vid in range(len(board.vertex_positions))]
+        self.available = set(range(len(board.vertex_positions)))
+        for vid in list(board.built_settlements) + list(board.built_cities):
+            self.on_settlement(vid)
+
+    def _score(self, vertex_id):
+        score = 0.0
+        resources = set()
+        for tile in self.board.vertex_tiles[vertex_id]:
+            if tile.number_token is None or tile.has_robber: continue
+            score += PIPS[tile.number_token] * self.scarcity[tile.resource_type]
+            resources.add(tile.resource_type)
+        if resources: score += DIVERSITY_BONUS * (len(resources) - 1)
+
+        port = self.board.vertex_ports.get(vertex_id)
+        if port: score += PORT_BONUS.get(port, SPECIAL_PORT_BONUS)
+        return score
+
+    def on_settlement(self, vertex_id):
+        self.available.discard(vertex_id)
+        self.available.difference_update(self.board.vertex_neighbors[vertex_id])
+
+    def on_robber(self, *tiles):
+        for tile in tiles:
+            for vid in tile.vertex_ids:
+                self.scores[vid] = self._score(vid)
+
+    def top(self, k, candidates=None):
+        pool = self.available if candidates is None else candidates
+        return heapq.nlargest(k, pool, key=self.scores.__getitem__)
+
+    def player_score(self, vertex_id, player):
+        # Base score plus a bonus for each resource around the vertex the player does not produce yet.
+        produced = set()
+        for vid in player.settlements + player.cities:
+            produced.update(self.board.get_resources_from_node(vid))
+        missing = set(self.board.get_resources_from_node(vertex_id)) - produced
+        return self.scores[vertex_id] + MISSING_RESOURCE_BONUS * len(missing)
+
+    def best_for(self, player, candidates=None, k=5):
+        top = self.top(k, candidates)
+        return max(top, key=lambda vid: self.player_score(vid, player)) if top else None
+
+    def best_road(self, road_spots):
+        # The road leading towards the best open vertex at or next to one of its ends.
+        board = self.board
+        best, best_score = None, -1.0
+        for eid in road_spots:
+            for vid in board.edge_vertices[eid]:
+                reach = (vid,) + board.vertex_neighbors[vid]
+                score = max((self.scores[v] for v in reach if v in self.available), default=0.0)
+                if score > best_score: best, best_score = eid, score
+        return best
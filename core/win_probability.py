@@ -0,0 +1,82 @@
+import random
+
+
+class WinProbability:
+    # Monte Carlo estimate of every player's chance to win: policy rollouts from the position to the 10 VP
+    # end, counted per Zobrist hash of the position. Asking about a position seen before starts from its
+    # stored counts, so only the missing rollouts are played, and estimating a game move after move only
+    # pays for the positions that changed. Games still undecided after max_turns go to the VP leaders.
+    def __init__(self, rollouts=200, max_turns=300, cache_size=4096):
+        self.rollouts = rollouts
+        self.max_turns = max_turns
+        self.cache_size = cache_size
+        self.cache = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def estimate(self, state, rng, rollouts=None):
+        n = state.num_players
+        if state.winner is not None: return [1.0 if p == state.winner else 0.0 for p in range(n)]
+
+        # Popped and put back, so the dict's order runs from least to most recently used.
+        wins, games = self.cache.pop(state.hash, None) or ([0.0] * n, 0)
+        if games: self.hits += 1
+        else: self.misses += 1
+
+        for _ in range(games, rollouts or self.rollouts):
+            s = state.clone()
+            s.rollout(rng, self.max_turns)
+            if s.winner is not None:
+                wins[s.winner] += 1
+            else:
+                points = [s.victory_points(p) for p in range(n)]
+                leaders = [p for p in range(n) if points[p] == max(points)]
+                for p in leaders: wins[p] += 1 / len(leaders)
+            games += 1
+
+        self.cache[state.hash] = (wins, games)
+        if len(self.cache) > self.cache_size: del self.cache[next(iter(self.cache))]
+        return [w / games for w in wins]
+
+
+_estimator = None
+_rng = random.Random()
+
+
+def _estimate_worker(args):
+    # Runs in the worker process, whose estimator and cache outlive the single estimate.
+    global _estimator
+    state, rollouts, max_turns = args
+    if _estimator is None: _estimator = WinProbability(rollouts, max_turns)
+    return _estimator.estimate(state, _rng)
+
+
+class WinProbabilityWorker:
+    # Keeps an estimate of the running game up to date from a single-process pool, so the frame loop only
+    # polls for results. One process means every request lands on the same warm cache.
+    def __init__(self, pool, rollouts=200, max_turns=300):
+        self.pool = pool
+        self.rollouts = rollouts
+        self.max_turns = max_turns
+        self.pending = None
+        self.requested = None
+        self.probabilities = None
+
+    def update(self, game):
+        # Collects a finished estimate and asks for a new one when the position has changed since the last
+        # request. Returns the latest probabilities, or None before the first one arrives.
+        if self.pending is not None and self.pending.ready():
+            self.probabilities = self.pending.get()
+            self.pending = None
+
+        if self.pending is None:
+            key = game.state_hash()
+            if key != self.requested:
+                self.requested = key
+                self.pending = self.pool.apply_async(_estimate_worker,
+                                                     ((game.ai_brain.get_state(), self.rollouts, self.max_turns),))
+        return self.probabilities
+
+    def is_busy(self):
+        return self.pending is not None
@@ -0,0 +1,100 @@
+from functools import lru_cache
+
+MASK = (1 << 64) - 1
+
+# Feature kinds; a key is derived from the kind and up to three small integers.
+PIECE, ROAD, ROBBER, HAND, DEV, ARMY, LONGEST, DECK, TURN, PHASE, DICE, PENDING, PERSPECTIVE = range(1, 14)
+PHASES = {'SETUP': 0, 'MAIN': 1}
+SUBPHASES = {'SETTLEMENT': 0, 'ROAD': 1}
+
+
+def _splitmix64(x):
+    x = (x + 0x9E3779B97F4A7C15) & MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK
+    return x ^ (x >> 31)
+
+
+@lru_cache(maxsize=None)
+def zobrist_key(kind, a=0, b=0, c=0):
+    # Keys are a pure function of the feature, so boards of any size and separate processes agree on them
+    # without sharing a table.
+    x = kind
+    for v in (a, b, c):
+        x = (x * 0x100000001B3 + v + 1) & MASK
+    return _splitmix64(x)
+
+
+def hand_key(p, hand):
+    key = 0
+    for res, count in enumerate(hand):
+        if count: key ^= zobrist_key(HAND, p, res, count)
+    return key
+
+
+def dev_key(p, vp, knight_cards, knights_played):
+    return zobrist_key(DEV, p, 0, vp) ^ zobrist_key(DEV, p, 1, knight_cards) ^ zobrist_key(DEV, p, 2, knights_played)
+
+
+def holders_key(army_holder, road_holder):
+    return zobrist_key(ARMY, army_holder) ^ zobrist_key(LONGEST, road_holder)
+
+
+def deck_key(deck):
+    return zobrist_key(DECK, *deck)
+
+
+def turn_key(current, phase, setup_step, subphase, dice_rolled, pending_robber):
+    # The turn counter is left out, so the same position reached on a later turn hashes the same.
+    key = zobrist_key(TURN, current) ^ zobrist_key(PHASE, PHASES[phase], setup_step, SUBPHASES.get(subphase, 2))
+    if dice_rolled: key ^= zobrist_key(DICE)
+    if pending_robber: key ^= zobrist_key(PENDING)
+    return key
+
+
+class TranspositionTable:
+    # Fixed number of slots indexed by the low bits of the hash, holding visit counts and summed rewards.
+    # On a collision the old entry is replaced when it comes from an earlier search or has no more
+    # visits than the new one, so well-explored entries of the current search survive.
+    def __init__(self, size=1 << 16):
+        self.size = size
+        self.keys = [0] * size
+        self.visits = [0] * size
+        self.values = [0.0] * size
+        self.ages = [0] * size
+        self.age = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.keys = [0] * self.size
+        self.visits = [0] * self.size
+        self.values = [0.0] * self.size
+        self.ages = [0] * self.size
+
+    def new_search(self):
+        self.age += 1
+
+    def get(self, key):
+        i = key % self.size
+        if self.keys[i] == key:
+            self.hits += 1
+            return self.visits[i], self.values[i]
+        self.misses += 1
+        return None
+
+    def add(self, key, visits, value):
+        i = key % self.size
+        if self.keys[i] == key:
+            self.visits[i] += visits
+            self.values[i] += value
+            self.ages[i] = self.age
+        elif self.ages[i] < self.age or visits >= self.visits[i]:
+            self.keys[i] = key
+            self.visits[i] = visits
+            self.values[i] = value
+            self.ages[i] = self.age
+
+    def __len__(self):
+        return sum(1 for key in self.keys if key)
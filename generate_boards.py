@@ -0,0 +1,35 @@
+import argparse
+import random
+import time
+
+import config
+from core.board_generator import BoardConstraints, BoardPool
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate balanced Catan boards into a pool file.")
+    parser.add_argument('-n', '--count', type=int, default=5000, help="number of boards to generate")
+    parser.add_argument('-s', '--seed', type=int, default=None, help="seed for reproducible pools")
+    parser.add_argument('-o', '--output', default=config.BOARD_POOL_FILE, help="pool file to write")
+    parser.add_argument('--radius', type=int, default=config.BOARD_RADIUS, help="board radius in hex rings")
+    parser.add_argument('--max-vertex-pips', type=int, default=12, help="highest pip total on any intersection")
+    parser.add_argument('--max-same-resource', type=int, default=1,
+                        help="how many neighbours of a tile may share its resource")
+    parser.add_argument('--allow-adjacent-red', action='store_true', help="let 6s and 8s touch")
+    parser.add_argument('--allow-adjacent-same', action='store_true', help="let equal numbers touch")
+    args = parser.parse_args()
+
+    constraints = BoardConstraints(no_adjacent_red=not args.allow_adjacent_red,
+                                   no_adjacent_same_number=not args.allow_adjacent_same,
+                                   max_same_resource_neighbors=args.max_same_resource,
+                                   max_vertex_pips=args.max_vertex_pips)
+
+    start = time.perf_counter()
+    pool = BoardPool(radius=args.radius)
+    pool.fill(args.count, random.Random(args.seed), constraints)
+    pool.save(args.output)
+    print(f"Wrote {args.count} boards to {args.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import pygame
+
+
+class DirtyRegions:
+    # Each named screen region is tracked by a state key and the rect it occupied. When either changes,
+    # the old and new rects are pushed to the display; everything else stays as it was last frame.
+    def __init__(self):
+        self.keys = {}
+        self.rects = {}
+        self.dirty = []
+        self.full = True
+
+    def track(self, name, key, rect=None):
+        if name in self.keys and self.keys[name] == key and self.rects[name] == rect: return False
+        old_rect = self.rects.get(name)
+        self.keys[name] = key
+        self.rects[name] = rect
+        if old_rect: self.dirty.append(old_rect)
+        if rect: self.dirty.append(rect)
+        return True
+
+    def invalidate(self):
+        self.full = True
+
+    def flush(self):
+        if self.full:
+            pygame.display.flip()
+        elif self.dirty:
+            pygame.display.update(self.dirty)
+        self.dirty = []
+        self.full = False
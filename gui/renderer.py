@@ -2,22 +2,37 @@ import pygame
 import math
 import os
 import config
+from gui.text_cache import get_font, render_text
 
 
 class BoardRenderer:
     def __init__(self, screen):
         self.screen = screen
-        self.font = pygame.font.SysFont('Arial', 20, bold=True)
-        self.ui_font = pygame.font.SysFont('Arial', 18)
-        self.title_font = pygame.font.SysFont('Arial', 28, bold=True)
-        self.port_font = pygame.font.SysFont('Arial', 16, bold=True)
+        self.font = get_font('Arial', 20, bold=True)
+        self.ui_font = get_font('Arial', 18)
+        self.title_font = get_font('Arial', 28, bold=True)
+        self.port_font = get_font('Arial', 16, bold=True)
 
         self.resource_images = {}
-        self._load_images()
-
-    def _load_images(self):
-        target_width = int(math.sqrt(3) * config.HEX_RADIUS) + 2
-        target_height = int(2 * config.HEX_RADIUS) + 2
+        self._image_size = None
+        self.scale = 1.0
+        self.token_font = self.font
+        self.token_small_font = self.ui_font
+        self._load_images(config.HEX_RADIUS)
+
+        self.board_layer = None
+        self._layer_board = None
+
+    def _load_images(self, size):
+        target_width = int(math.sqrt(3) * size) + 2
+        target_height = int(2 * size) + 2
+        self._image_size = size
+
+        # Pieces, tokens and ports shrink with the hexes so they keep their proportions on larger boards.
+        self.scale = size / config.HEX_RADIUS
+        self.token_font = get_font('Arial', self.px(20), bold=True)
+        self.token_small_font = get_font('Arial', self.px(18))
+        self.port_font = get_font('Arial', self.px(16), bold=True)
 
         if hasattr(config, 'RESOURCE_IMAGES'):
             for res_type, file_path in config.RESOURCE_IMAGES.items():
@@ -29,94 +44,117 @@ class BoardRenderer:
                     except Exception:
                         pass
 
-    def draw_board(self, board, hovered_vertex=None, hovered_edge=None):
-        self.screen.fill((60, 100, 200))
+    def px(self, n):
+        return max(1, round(n * self.scale))
 
-        for tile in board.tiles:
-            if not tile.is_highlighted: self.draw_hex_tile(tile)
-        for tile in board.tiles:
-            if tile.is_highlighted: self.draw_hex_tile(tile)
+    def _render_board_layer(self, board):
+        # Tiles, outlines, number tokens and ports never change after generation, so they are drawn once
+        # into an off-screen surface. The robber and the highlight are drawn on top of it every frame.
+        if board.hex_size != self._image_size: self._load_images(board.hex_size)
+        layer = pygame.Surface(self.screen.get_size()).convert()
+        layer.fill((60, 100, 200))
 
-        self.draw_ports(board)
+        for tile in board.tiles:
+            self.draw_hex_tile(tile, layer)
+        self.draw_ports(board, layer)
 
-        for edge, player in board.built_roads.items():
-            pygame.draw.line(self.screen, (0, 0, 0), edge[0], edge[1], width=10)
-            pygame.draw.line(self.screen, player.color, edge[0], edge[1], width=6)
+        self.board_layer = layer
+        self._layer_board = board
 
-        for node, player in board.built_settlements.items():
-            pygame.draw.circle(self.screen, (0, 0, 0), (int(node[0]), int(node[1])), 16)
-            pygame.draw.circle(self.screen, player.color, (int(node[0]), int(node[1])), 13)
-            pygame.draw.circle(self.screen, (255, 255, 255), (int(node[0]), int(node[1])), 5)
+    def draw_board(self, board, hovered_vertex=None, hovered_edge=None):
+        if self._layer_board is not board:
+            self._render_board_layer(board)
+        self.screen.blit(self.board_layer, (0, 0))
 
-        for node, player in board.built_cities.items():
+        for tile in board.tiles:
+            if tile.is_highlighted or tile.has_robber: self.draw_tile_overlay(tile)
+
+        px = self.px
+        for edge_id, player in board.built_roads.items():
+            edge = board.get_edge_points(edge_id)
+            pygame.draw.line(self.screen, (0, 0, 0), edge[0], edge[1], width=px(10))
+            pygame.draw.line(self.screen, player.color, edge[0], edge[1], width=px(6))
+
+        for vertex_id, player in board.built_settlements.items():
+            node = board.vertex_positions[vertex_id]
+            pygame.draw.circle(self.screen, (0, 0, 0), (int(node[0]), int(node[1])), px(16))
+            pygame.draw.circle(self.screen, player.color, (int(node[0]), int(node[1])), px(13))
+            pygame.draw.circle(self.screen, (255, 255, 255), (int(node[0]), int(node[1])), px(5))
+
+        for vertex_id, player in board.built_cities.items():
+            node = board.vertex_positions[vertex_id]
             x, y = int(node[0]), int(node[1])
-            pygame.draw.rect(self.screen, (0, 0, 0), (x - 14, y - 14, 28, 28))
-            pygame.draw.rect(self.screen, player.color, (x - 11, y - 11, 22, 22))
-            pygame.draw.rect(self.screen, (255, 255, 255), (x - 6, y - 6, 5, 5))
-            pygame.draw.rect(self.screen, (255, 255, 255), (x + 1, y - 6, 5, 5))
+            pygame.draw.rect(self.screen, (0, 0, 0), (x - px(14), y - px(14), 2 * px(14), 2 * px(14)))
+            pygame.draw.rect(self.screen, player.color, (x - px(11), y - px(11), 2 * px(11), 2 * px(11)))
+            pygame.draw.rect(self.screen, (255, 255, 255), (x - px(6), y - px(6), px(5), px(5)))
+            pygame.draw.rect(self.screen, (255, 255, 255), (x + px(1), y - px(6), px(5), px(5)))
 
-        if hovered_edge: self.draw_hovered_edge(hovered_edge)
-        if hovered_vertex: self.draw_hovered_vertex(hovered_vertex)
+        if hovered_edge is not None: self.draw_hovered_edge(board.get_edge_points(hovered_edge))
+        if hovered_vertex is not None: self.draw_hovered_vertex(board.vertex_positions[hovered_vertex])
 
-    def draw_hex_tile(self, tile):
+    def draw_hex_tile(self, tile, surface):
         points = tile.get_vertices()
 
         if tile.resource_type in self.resource_images:
             img = self.resource_images[tile.resource_type]
             rect = img.get_rect(center=(tile.pixel_x, tile.pixel_y))
-            self.screen.blit(img, rect)
+            surface.blit(img, rect)
         else:
             color = config.RESOURCE_COLORS.get(tile.resource_type, (100, 100, 100))
-            pygame.draw.polygon(self.screen, color, points)
+            pygame.draw.polygon(surface, color, points)
 
-        pygame.draw.polygon(self.screen, (50, 50, 50), points, 2)
+        pygame.draw.polygon(surface, (50, 50, 50), points, 2)
 
+        if tile.number_token is not None:
+            self.draw_number_token(tile.pixel_x, tile.pixel_y, tile.number_token, surface)
+
+    def draw_tile_overlay(self, tile):
         if tile.is_highlighted:
-            pygame.draw.polygon(self.screen, (255, 255, 255), points, 4)
+            pygame.draw.polygon(self.screen, (255, 255, 255), tile.get_vertices(), 4)
 
         if tile.has_robber:
             cx, cy = int(tile.pixel_x), int(tile.pixel_y)
-            pygame.draw.circle(self.screen, (30, 30, 30), (cx, cy), 20)
-            pygame.draw.circle(self.screen, (200, 50, 50), (cx, cy), 20, 3)
-            self.screen.blit(self.font.render("!", True, (255, 255, 255)), (cx - 4, cy - 12))
-        elif tile.number_token is not None:
-            self.draw_number_token(tile.pixel_x, tile.pixel_y, tile.number_token)
+            pygame.draw.circle(self.screen, (30, 30, 30), (cx, cy), self.px(20))
+            pygame.draw.circle(self.screen, (200, 50, 50), (cx, cy), self.px(20), self.px(3))
+            mark = render_text(self.token_font, "!", (255, 255, 255))
+            self.screen.blit(mark, mark.get_rect(center=(cx, cy)))
 
-    def draw_ports(self, board):
+    def draw_ports(self, board, surface):
+        px = self.px
         for port in board.ports:
-            p1, p2 = port['edge']
+            p1, p2 = board.get_edge_points(port['edge'])
             res_type = port['type']
 
             mid_x = (p1[0] + p2[0]) / 2
             mid_y = (p1[1] + p2[1]) / 2
 
-            pygame.draw.line(self.screen, (101, 67, 33), p1, (mid_x, mid_y), width=6)
-            pygame.draw.line(self.screen, (101, 67, 33), p2, (mid_x, mid_y), width=6)
+            pygame.draw.line(surface, (101, 67, 33), p1, (mid_x, mid_y), width=px(6))
+            pygame.draw.line(surface, (101, 67, 33), p2, (mid_x, mid_y), width=px(6))
 
             bg_color = (240, 240, 240) if res_type == '3:1' else (255, 255, 255)
-            pygame.draw.circle(self.screen, (0, 0, 0), (int(mid_x), int(mid_y)), 20)
-            pygame.draw.circle(self.screen, bg_color, (int(mid_x), int(mid_y)), 18)
+            pygame.draw.circle(surface, (0, 0, 0), (int(mid_x), int(mid_y)), px(20))
+            pygame.draw.circle(surface, bg_color, (int(mid_x), int(mid_y)), px(18))
 
             if res_type != '3:1':
                 res_col = config.RESOURCE_COLORS.get(res_type, (150, 150, 150))
-                pygame.draw.circle(self.screen, res_col, (int(mid_x), int(mid_y)), 14)
+                pygame.draw.circle(surface, res_col, (int(mid_x), int(mid_y)), px(14))
             else:
-                pygame.draw.circle(self.screen, (180, 180, 180), (int(mid_x), int(mid_y)), 14)
+                pygame.draw.circle(surface, (180, 180, 180), (int(mid_x), int(mid_y)), px(14))
 
             label = "?" if res_type == '3:1' else "2:1"
             txt_col = (0, 0, 0)
             if res_type in ['brick', 'ore', 'wood'] and res_type != '3:1':
                 txt_col = (255, 255, 255)
 
-            txt_surf = self.port_font.render(label, True, txt_col)
+            txt_surf = render_text(self.port_font, label, txt_col)
             txt_rect = txt_surf.get_rect(center=(int(mid_x), int(mid_y)))
-            self.screen.blit(txt_surf, txt_rect)
+            surface.blit(txt_surf, txt_rect)
 
             if res_type == '3:1':
-                ratio_surf = self.port_font.render("3:1", True, (255, 255, 255))
-                bg_ratio = ratio_surf.get_rect(center=(int(mid_x), int(mid_y) + 22)).inflate(4, 2)
-                pygame.draw.rect(self.screen, (0, 0, 0), bg_ratio, 0, 4)
-                self.screen.blit(ratio_surf, ratio_surf.get_rect(center=(int(mid_x), int(mid_y) + 22)))
+                ratio_surf = render_text(self.port_font, "3:1", (255, 255, 255))
+                bg_ratio = ratio_surf.get_rect(center=(int(mid_x), int(mid_y) + px(22))).inflate(4, 2)
+                pygame.draw.rect(surface, (0, 0, 0), bg_ratio, 0, 4)
+                surface.blit(ratio_surf, ratio_surf.get_rect(center=(int(mid_x), int(mid_y) + px(22))))
 
     def draw_ui(self, player, mode, dice_roll=0):
         START_X = 20
@@ -135,22 +173,22 @@ class BoardRenderer:
         pygame.draw.rect(self.screen, player.color, (START_X + 2, START_Y + 2, PANEL_WIDTH - 4, 40), 0, 10)
 
         cursor_y = START_Y + 10
-        name_txt = self.font.render(f"{player.name}", True, (255, 255, 255) if sum(player.color) < 400 else (0, 0, 0))
+        name_txt = render_text(self.font, f"{player.name}", (255, 255, 255) if sum(player.color) < 400 else (0, 0, 0))
         self.screen.blit(name_txt, (START_X + 15, cursor_y))
         cursor_y += 45
 
-        self.screen.blit(self.ui_font.render(f"Points: {player.victory_points} / 10", True, (0, 0, 100)),
+        self.screen.blit(render_text(self.ui_font, f"Points: {player.victory_points} / 10", (0, 0, 100)),
                          (START_X + 15, cursor_y));
         cursor_y += 25
 
         if dice_roll > 0:
             col = (200, 0, 0) if dice_roll == 7 else (0, 100, 0)
-            self.screen.blit(self.font.render(f"Roll: {dice_roll}", True, col), (START_X + 15, cursor_y))
+            self.screen.blit(render_text(self.font, f"Roll: {dice_roll}", col), (START_X + 15, cursor_y))
         else:
-            self.screen.blit(self.font.render(">> ROLL DICE (R) <<", True, (220, 50, 0)), (START_X + 15, cursor_y))
+            self.screen.blit(render_text(self.font, ">> ROLL DICE (R) <<", (220, 50, 0)), (START_X + 15, cursor_y))
         cursor_y += 30
 
-        self.screen.blit(self.ui_font.render(f"Mode: {mode.upper()}", True, (80, 80, 80)), (START_X + 15, cursor_y));
+        self.screen.blit(render_text(self.ui_font, f"Mode: {mode.upper()}", (80, 80, 80)), (START_X + 15, cursor_y));
         cursor_y += 25
         pygame.draw.line(self.screen, (200, 200, 200), (START_X + 10, cursor_y), (START_X + PANEL_WIDTH - 10, cursor_y),
                          2);
@@ -160,7 +198,7 @@ class BoardRenderer:
             col = config.RESOURCE_COLORS.get(res, (0, 0, 0))
             pygame.draw.rect(self.screen, (0, 0, 0), (START_X + 15, cursor_y + 4, 16, 16), 1)
             pygame.draw.rect(self.screen, col, (START_X + 16, cursor_y + 5, 14, 14))
-            self.screen.blit(self.ui_font.render(f"{res.capitalize()}: {amt}", True, (0, 0, 0)),
+            self.screen.blit(render_text(self.ui_font, f"{res.capitalize()}: {amt}", (0, 0, 0)),
                              (START_X + 40, cursor_y));
             cursor_y += 22
 
@@ -168,7 +206,7 @@ class BoardRenderer:
                          (START_X + PANEL_WIDTH - 10, cursor_y + 5), 2);
         cursor_y += 15
 
-        self.screen.blit(self.font.render("Dev Cards:", True, (50, 50, 50)), (START_X + 15, cursor_y));
+        self.screen.blit(render_text(self.font, "Dev Cards:", (50, 50, 50)), (START_X + 15, cursor_y));
         cursor_y += 25
 
         cards = [
@@ -183,26 +221,47 @@ class BoardRenderer:
         ]
 
         for txt, col in cards:
-            self.screen.blit(self.ui_font.render(txt, True, col), (START_X + 15, cursor_y));
+            self.screen.blit(render_text(self.ui_font, txt, col), (START_X + 15, cursor_y));
             cursor_y += 20
 
         cursor_y += 10
 
         if player.has_longest_road:
             pygame.draw.rect(self.screen, (255, 215, 0), (START_X + 10, cursor_y, 240, 24), 0, 5)
-            self.screen.blit(self.ui_font.render("LONGEST ROAD (+2)", True, (0, 0, 0)), (START_X + 50, cursor_y + 2));
+            self.screen.blit(render_text(self.ui_font, "LONGEST ROAD (+2)", (0, 0, 0)), (START_X + 50, cursor_y + 2));
             cursor_y += 30
         if player.has_largest_army:
             pygame.draw.rect(self.screen, (200, 50, 50), (START_X + 10, cursor_y, 240, 24), 0, 5)
-            self.screen.blit(self.ui_font.render("LARGEST ARMY (+2)", True, (255, 255, 255)),
+            self.screen.blit(render_text(self.ui_font, "LARGEST ARMY (+2)", (255, 255, 255)),
                              (START_X + 50, cursor_y + 2))
 
         footer_y = START_Y + PANEL_HEIGHT - 50
-        self.screen.blit(self.ui_font.render("[T] Bank Trade   [P] Player Trade", True, (100, 100, 100)),
+        self.screen.blit(render_text(self.ui_font, "[T] Bank Trade   [P] Player Trade", (100, 100, 100)),
                          (START_X + 15, footer_y))
-        self.screen.blit(self.ui_font.render("[S] Save Game    [L] Load Game", True, (100, 100, 100)),
+        self.screen.blit(render_text(self.ui_font, "[S] Save Game    [L] Load Game", (100, 100, 100)),
                          (START_X + 15, footer_y + 25))
 
+        return pygame.Rect(START_X, START_Y, PANEL_WIDTH + 5, PANEL_HEIGHT + 5)
+
+    def draw_win_probability(self, players, probabilities):
+        # Stacked bar of every player's estimated chance to win, under the player panel.
+        X, Y, W, H = 20, 720, 280, 26
+        title = render_text(self.ui_font, "Win chance", (255, 255, 255))
+        self.screen.blit(title, (X, Y - 22))
+
+        left = X
+        for i, (player, chance) in enumerate(zip(players, probabilities)):
+            width = W - (left - X) if i == len(players) - 1 else round(W * chance)
+            if width <= 0: continue
+            pygame.draw.rect(self.screen, player.color, (left, Y, width, H))
+            if width >= 34:
+                col = (255, 255, 255) if sum(player.color) < 400 else (0, 0, 0)
+                txt = render_text(self.ui_font, f"{chance:.0%}", col)
+                self.screen.blit(txt, txt.get_rect(center=(left + width // 2, Y + H // 2)))
+            left += width
+        pygame.draw.rect(self.screen, (0, 0, 0), (X, Y, W, H), 2)
+        return pygame.Rect(X, Y - 22, W, H + 22)
+
     def draw_trade_menu(self, trade_offer, player):
         self._draw_modern_box("BANK / PORT TRADE",
                               "STEP 1: Choose resource to GIVE" if not trade_offer else f"STEP 2: Giving {trade_offer.upper()}",
@@ -219,7 +278,6 @@ class BoardRenderer:
     def draw_p2p_menu(self, game):
         offer = game.p2p_offer
         active_side = game.p2p_active_side
-        target_name = game.players[game.p2p_target_idx].name
 
         W, H = 600, 400;
         CX, CY = config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2
@@ -233,38 +291,71 @@ class BoardRenderer:
         pygame.draw.rect(self.screen, (30, 35, 45), rect, 0, 15)
         pygame.draw.rect(self.screen, (255, 215, 0), rect, 3, 15)
 
-        title = self.title_font.render("PLAYER TRADE PROPOSAL", True, (255, 215, 0))
+        title = render_text(self.title_font, "PLAYER TRADE PROPOSAL", (255, 215, 0))
         self.screen.blit(title, title.get_rect(center=(CX, CY - 160)))
 
-        target_txt = self.font.render(f"TRADING WITH: {target_name}", True, (50, 200, 255))
+        target_txt = render_text(self.font, "OFFER TO ALL PLAYERS", (50, 200, 255))
         self.screen.blit(target_txt, target_txt.get_rect(center=(CX, CY - 130)))
 
-        instr = self.ui_font.render("[TAB] Switch Side  |  [SPACE] Change Partner  |  [ENTER] Propose", True,
-                                    (200, 200, 200))
+        instr = render_text(self.ui_font, "[TAB] Switch Side  |  [ENTER] Propose  |  [ESC] Cancel",
+                            (200, 200, 200))
         self.screen.blit(instr, instr.get_rect(center=(CX, CY + 170)))
 
         col_give = (100, 255, 100) if active_side == 'give' else (100, 100, 100)
         pygame.draw.rect(self.screen, col_give, (CX - 250, CY - 100, 220, 220), 2)
-        lbl_give = self.font.render("YOU GIVE", True, col_give)
+        lbl_give = render_text(self.font, "YOU GIVE", col_give)
         self.screen.blit(lbl_give, (CX - 200, CY - 130))
 
         y_off = 0
         for res, amt in offer['give'].items():
-            txt = self.font.render(f"{amt} x {res.upper()}", True, (255, 255, 255))
+            txt = render_text(self.font, f"{amt} x {res.upper()}", (255, 255, 255))
             self.screen.blit(txt, (CX - 230, CY - 80 + y_off));
             y_off += 30
 
         col_get = (100, 255, 100) if active_side == 'get' else (100, 100, 100)
         pygame.draw.rect(self.screen, col_get, (CX + 30, CY - 100, 220, 220), 2)
-        lbl_get = self.font.render("YOU WANT", True, col_get)
+        lbl_get = render_text(self.font, "YOU WANT", col_get)
         self.screen.blit(lbl_get, (CX + 80, CY - 130))
 
         y_off = 0
         for res, amt in offer['get'].items():
-            txt = self.font.render(f"{amt} x {res.upper()}", True, (255, 255, 255))
+            txt = render_text(self.font, f"{amt} x {res.upper()}", (255, 255, 255))
             self.screen.blit(txt, (CX + 50, CY - 80 + y_off));
             y_off += 30
 
+    def draw_p2p_responses(self, game):
+        W, H = 700, 120 + 40 * min(len(game.p2p_responses), 9)
+        CX, CY = config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2
+
+        overlay = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        overlay.set_alpha(200)
+        overlay.fill((0, 0, 0))
+        self.screen.blit(overlay, (0, 0))
+
+        rect = pygame.Rect(CX - W // 2, CY - H // 2, W, H)
+        pygame.draw.rect(self.screen, (30, 35, 45), rect, 0, 15)
+        pygame.draw.rect(self.screen, (255, 215, 0), rect, 3, 15)
+
+        title = render_text(self.title_font, "TRADE ANSWERS", (255, 215, 0))
+        self.screen.blit(title, title.get_rect(center=(CX, rect.top + 35)))
+
+        def cards(offer):
+            return ", ".join(f"{amt} {res.upper()}" for res, amt in offer.items()) or "nothing"
+
+        for i, response in enumerate(game.p2p_responses[:9]):
+            if response.kind == 'accept':
+                text, col = f"[{i + 1}] {response.partner.name} accepts", (100, 255, 100)
+            elif response.kind == 'counter':
+                text = f"[{i + 1}] {response.partner.name}: you give {cards(response.give)}, get {cards(response.get)}"
+                col = (255, 215, 0)
+            else:
+                text, col = f"[{i + 1}] Ask {response.partner.name}", (50, 200, 255)
+            txt = render_text(self.font, text, col)
+            self.screen.blit(txt, (rect.left + 30, rect.top + 70 + 40 * i))
+
+        instr = render_text(self.ui_font, "[1-9] Take a deal  |  [ESC] Back to the offer", (200, 200, 200))
+        self.screen.blit(instr, instr.get_rect(center=(CX, rect.bottom - 25)))
+
     def draw_p2p_confirm(self, game):
         target_player = game.players[game.p2p_target_idx]
         current_player = game.get_current_player()
@@ -280,43 +371,60 @@ class BoardRenderer:
         pygame.draw.rect(self.screen, (50, 0, 0), (CX - W // 2, CY - H // 2, W, H), 0, 20)
         pygame.draw.rect(self.screen, (255, 0, 0), (CX - W // 2, CY - H // 2, W, H), 4, 20)
 
-        msg1 = self.title_font.render(f"{target_player.name.upper()}!", True, (255, 255, 255))
+        msg1 = render_text(self.title_font, f"{target_player.name.upper()}!", (255, 255, 255))
         self.screen.blit(msg1, msg1.get_rect(center=(CX, CY - 60)))
 
-        msg2 = self.font.render(f"{current_player.name} offers a trade.", True, (200, 200, 200))
+        msg2 = render_text(self.font, f"{current_player.name} offers a trade.", (200, 200, 200))
         self.screen.blit(msg2, msg2.get_rect(center=(CX, CY - 20)))
 
-        msg3 = self.title_font.render("Do you ACCEPT?", True, (255, 215, 0))
+        msg3 = render_text(self.title_font, "Do you ACCEPT?", (255, 215, 0))
         self.screen.blit(msg3, msg3.get_rect(center=(CX, CY + 30)))
 
-        keys = self.font.render("[Y] YES      [N] NO", True, (255, 255, 255))
+        keys = render_text(self.font, "[Y] YES      [N] NO", (255, 255, 255))
         self.screen.blit(keys, keys.get_rect(center=(CX, CY + 80)))
 
-    def draw_number_token(self, x, y, number):
-        pygame.draw.circle(self.screen, (240, 230, 200), (int(x), int(y)), 18)
-        pygame.draw.circle(self.screen, (0, 0, 0), (int(x), int(y)), 18, 1)
+    def draw_number_token(self, x, y, number, surface):
+        pygame.draw.circle(surface, (240, 230, 200), (int(x), int(y)), self.px(18))
+        pygame.draw.circle(surface, (0, 0, 0), (int(x), int(y)), self.px(18), 1)
 
         col = (200, 0, 0) if number in [6, 8] else (0, 0, 0)
-        f = self.font if number in [6, 8] else self.ui_font
+        f = self.token_font if number in [6, 8] else self.token_small_font
+
+        txt = render_text(f, str(number), col)
+        surface.blit(txt, txt.get_rect(center=(int(x), int(y))))
+
+    def vertex_rect(self, board, vertex_id):
+        x, y = board.vertex_positions[vertex_id]
+        half = self.px(17)
+        return pygame.Rect(int(x) - half, int(y) - half, 2 * half, 2 * half)
+
+    def edge_rect(self, board, edge_id):
+        (x1, y1), (x2, y2) = board.get_edge_points(edge_id)
+        return pygame.Rect(int(min(x1, x2)), int(min(y1, y2)), int(abs(x2 - x1)) + 1,
+                           int(abs(y2 - y1)) + 1).inflate(self.px(12), self.px(12))
 
-        txt = f.render(str(number), True, col)
-        self.screen.blit(txt, txt.get_rect(center=(int(x), int(y))))
+    def tile_rect(self, tile):
+        xs = [p[0] for p in tile.get_vertices()]
+        ys = [p[1] for p in tile.get_vertices()]
+        return pygame.Rect(int(min(xs)), int(min(ys)), int(max(xs) - min(xs)) + 1,
+                           int(max(ys) - min(ys)) + 1).inflate(6, 6)
 
     def draw_hovered_vertex(self, vertex):
-        s = pygame.Surface((30, 30), pygame.SRCALPHA)
-        pygame.draw.circle(s, (255, 255, 255, 150), (15, 15), 10)
-        pygame.draw.circle(s, (255, 255, 255, 255), (15, 15), 10, 2)
-        self.screen.blit(s, (vertex[0] - 15, vertex[1] - 15))
+        half, radius = self.px(15), self.px(10)
+        s = pygame.Surface((2 * half, 2 * half), pygame.SRCALPHA)
+        pygame.draw.circle(s, (255, 255, 255, 150), (half, half), radius)
+        pygame.draw.circle(s, (255, 255, 255, 255), (half, half), radius, 2)
+        self.screen.blit(s, (vertex[0] - half, vertex[1] - half))
 
     def draw_hovered_edge(self, edge):
-        pygame.draw.line(self.screen, (255, 255, 255), edge[0], edge[1], width=6)
+        pygame.draw.line(self.screen, (255, 255, 255), edge[0], edge[1], width=self.px(6))
 
     def draw_winner(self, winner_name):
         s = pygame.Surface(self.screen.get_size());
         s.set_alpha(220);
         s.fill((0, 0, 0));
         self.screen.blit(s, (0, 0))
-        t = self.title_font.render(f"{winner_name} WINS!", True, (255, 215, 0))
+        t = render_text(self.title_font, f"{winner_name} WINS!", (255, 215, 0))
         self.screen.blit(t, t.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2)))
 
     def _draw_modern_box(self, title, subtitle, sub2="", player=None, trade_mode=False):
@@ -335,14 +443,14 @@ class BoardRenderer:
         pygame.draw.rect(self.screen, (40, 45, 55), rect, 0, 15)
         pygame.draw.rect(self.screen, (255, 215, 0), rect, 2, 15)
 
-        t_surf = self.title_font.render(title, True, (255, 215, 0))
+        t_surf = render_text(self.title_font, title, (255, 215, 0))
         self.screen.blit(t_surf, t_surf.get_rect(center=(CX, CY - 120)))
 
-        st_surf = self.font.render(subtitle, True, (220, 220, 220))
+        st_surf = render_text(self.font, subtitle, (220, 220, 220))
         self.screen.blit(st_surf, st_surf.get_rect(center=(CX, CY - 70)))
 
         if sub2:
-            st2_surf = self.ui_font.render(sub2, True, (150, 255, 150))
+            st2_surf = render_text(self.ui_font, sub2, (150, 255, 150))
             self.screen.blit(st2_surf, st2_surf.get_rect(center=(CX, CY - 40)))
 
         keys = ["W", "B", "S", "G", "O"]
@@ -359,12 +467,12 @@ class BoardRenderer:
             pygame.draw.rect(self.screen, colors[i], (bx, y_pos, 50, 50), 0, 8)
             pygame.draw.rect(self.screen, (255, 255, 255), (bx, y_pos, 50, 50), 2, 8)
 
-            k_s = self.font.render(key, True, (0, 0, 0))
+            k_s = render_text(self.font, key, (0, 0, 0))
             self.screen.blit(k_s, (bx + 16, y_pos + 11))
-            k_txt = self.font.render(key, True, (255, 255, 255))
+            k_txt = render_text(self.font, key, (255, 255, 255))
             self.screen.blit(k_txt, (bx + 15, y_pos + 10))
 
-            n_txt = self.ui_font.render(names[i], True, (200, 200, 200))
+            n_txt = render_text(self.ui_font, names[i], (200, 200, 200))
             self.screen.blit(n_txt, (bx + 5, y_pos + 55))
 
             if trade_mode and player:
@@ -374,8 +482,8 @@ class BoardRenderer:
 
                 has_enough = player.resources[res_type] >= cost
                 c_col = (100, 255, 100) if has_enough else (255, 100, 100)
-                cost_txt = self.ui_font.render(f"Cost: {cost}", True, c_col)
+                cost_txt = render_text(self.ui_font, f"Cost: {cost}", c_col)
                 self.screen.blit(cost_txt, (bx + 2, y_pos + 75))
 
-        esc = self.ui_font.render("Press [ESC] to Cancel", True, (255, 100, 100))
+        esc = render_text(self.ui_font, "Press [ESC] to Cancel", (255, 100, 100))
         self.screen.blit(esc, esc.get_rect(center=(CX, CY + 130)))
\ No newline at end of file
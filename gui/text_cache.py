@@ -0,0 +1,23 @@
+from functools import lru_cache
+
+import pygame
+
+TEXT_CACHE_SIZE = 512
+
+_fonts = {}
+
+
+def get_font(name, size, bold=False):
+    # SysFont scans the system font list on every call, so each (name, size, bold) is created once.
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size, bold=bold)
+        _fonts[key] = font
+    return font
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(font, text, color):
+    # The returned surface is shared between callers and must only be blitted, never drawn on.
+    return font.render(text, True, color)
@@ -1,164 +1,235 @@
 import pygame
+import os
 import sys
 import config
+from multiprocessing import Pool
 
-from core.board import Board
-from core.player import Player
-from core.ai import AIController
+from core.board_generator import BoardPool
+from core.game_engine import GameEngine
 from core.input_manager import InputManager
-from core.rules_manager import RulesManager
-from core.storage_manager import StorageManager
+from core.mcts import MCTS, ParallelMCTS
+from core.win_probability import WinProbabilityWorker
+from core.zobrist import TranspositionTable
+from gui.dirty_rects import DirtyRegions
 from gui.renderer import BoardRenderer
+from gui.text_cache import get_font, render_text
 
 
-class Game:
-    def __init__(self):
+class Game(GameEngine):
+    def __init__(self, seed=None):
         pygame.init()
         self.screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
-        pygame.display.set_caption("Catan - 4 Players Mode")
+        pygame.display.set_caption(f"Catan - {config.NUM_PLAYERS} Players Mode")
         self.clock = pygame.time.Clock()
         self.running = True
 
-        self.board = Board()
-        self.board.generate_random_board()
-
-        p1 = Player("Human (Red)", (255, 50, 50), is_ai=False)
-        p2 = Player("AI 1 (Blue)", (50, 50, 255), is_ai=True)
-        p3 = Player("AI 2 (Green)", (34, 139, 34), is_ai=True)
-        p4 = Player("AI 3 (Orange)", (255, 140, 0), is_ai=True)
-
-        self.players = [p1, p2, p3, p4]
-
         self.renderer = BoardRenderer(self.screen)
-        self.ai_brain = AIController(self)
+        self.dirty_regions = DirtyRegions()
+        self.hovered_vertex = None
+        self.hovered_edge = None
+        self.selected_hex = None
+        self._hover_key = None
+        self.search_pool = None
+        self.odds_pool = None
+        self.win_odds = None
+        self.win_probabilities = None
+        self.ai_turn = None
+        self.ai_pause = 0
+
+        board_pool = BoardPool.load(config.BOARD_POOL_FILE) if os.path.exists(config.BOARD_POOL_FILE) else None
+        if board_pool and board_pool.radius != config.BOARD_RADIUS: board_pool = None
+        super().__init__(seed=seed, board_pool=board_pool)
+        self.search_slice = config.AI_SEARCH_SLICE
+        if config.AI_SEARCH == 'mcts':
+            iterations = config.MCTS_ITERATIONS if config.MCTS_TIME_BUDGET is None else float('inf')
+            if config.MCTS_WORKERS > 1:
+                # One pool shared by all AI seats; only one of them thinks at a time.
+                self.search_pool = Pool(config.MCTS_WORKERS)
+                self.searches = {i: ParallelMCTS(self.search_pool, config.MCTS_WORKERS, iterations,
+                                                 config.MCTS_TIME_BUDGET) for i, p in enumerate(self.players) if p.is_ai}
+            else:
+                self.searches = {i: MCTS(iterations, config.MCTS_TIME_BUDGET,
+                                         table=TranspositionTable(config.MCTS_TABLE_SIZE))
+                                 for i, p in enumerate(self.players) if p.is_ai}
+        if config.WIN_PROBABILITY_BAR:
+            self.odds_pool = Pool(1)
+            self.win_odds = WinProbabilityWorker(self.odds_pool, config.WIN_PROBABILITY_ROLLOUTS)
         self.input_manager = InputManager(self)
-        self.rules_manager = RulesManager(self)
-        self.storage_manager = StorageManager(self)
-
-        self.game_phase = 'SETUP'
-
-        num_players = len(self.players)
-        self.setup_order = list(range(num_players)) + list(range(num_players - 1, -1, -1))
-
-        self.setup_step_idx = 0
-        self.setup_subphase = 'SETTLEMENT'
-
-        self.current_player_idx = self.setup_order[0]
-        self.winner = None
-
-        self.interaction_mode = 'view'
-        self.trade_offer = None
-
-        self.p2p_offer = {'give': {}, 'get': {}}
-        self.p2p_active_side = 'give'
-        self.p2p_target_idx = 0
-
-        self.last_dice_roll = 0
-        self.dice_rolled_this_turn = False
-        self.yop_selected_resources = []
-        self.message = "SETUP PHASE: Place Settlement"
-        self.message_timer = 0
-
-    def get_current_player(self):
-        return self.players[self.current_player_idx]
-
-    def set_message(self, text, duration=120):
-        self.message = text
-        self.message_timer = duration
-        self.draw()
 
     def reinit_controllers(self):
-        self.ai_brain = AIController(self)
+        super().reinit_controllers()
         self.input_manager = InputManager(self)
-        self.rules_manager = RulesManager(self)
+        self.ai_turn = None
 
-    def update(self):
-        if self.winner: return
-        for p in self.players:
-            if p.update_victory_points() >= 10: self.winner = p.name
+        for tile in self.board.tiles: tile.is_highlighted = False
+        self.selected_hex = None
 
+    def update_message(self, elapsed_ms):
         if self.message_timer > 0:
-            self.message_timer -= 1
+            self.message_timer -= elapsed_ms
+            if self.message_timer > 0: return False
+
+        if self.game_phase == 'SETUP':
+            default = f"SETUP: {self.get_current_player().name} place {self.setup_subphase}"
         else:
-            if self.game_phase == 'SETUP':
-                self.message = f"SETUP: {self.get_current_player().name} place {self.setup_subphase}"
-            else:
-                self.message = ""
+            default = ""
+        if self.message == default: return False
+        self.message = default
+        return True
+
+    def step_ai_turn(self, elapsed_ms):
+        # Advances the AI turn by one step once its pause has run out; the frame loop keeps running between.
+        if self.ai_turn is None:
+            self.ai_turn = self.start_ai_turn()
+            self.ai_pause = 0
+        self.ai_pause -= elapsed_ms
+        if self.ai_pause > 0: return
+        try:
+            self.ai_pause = next(self.ai_turn)
+        except StopIteration:
+            self.ai_turn = None
+
+    def update(self, elapsed_ms=0):
+        if self.winner: return
+        self.check_winner()
+        if self.win_odds and not self.winner: self.win_probabilities = self.win_odds.update(self)
 
         curr = self.get_current_player()
 
         if curr.is_ai and not self.winner:
-            if self.game_phase == 'SETUP':
-                self.ai_brain.run_setup_turn(curr)
-            else:
-                self.ai_brain.run_main_turn(curr)
+            self.step_ai_turn(elapsed_ms)
             return
 
         mx, my = pygame.mouse.get_pos()
-        self.hovered_vertex = None;
-        self.hovered_edge = None;
-        self.selected_hex = None
-        for tile in self.board.tiles:
-            if tile.contains_point(mx, my):
-                tile.is_highlighted = True;
-                self.selected_hex = tile
-                if self.game_phase == 'SETUP':
-                    if self.setup_subphase == 'SETTLEMENT': v = tile.get_nearest_vertex(mx,
-                                                                                        my); self.hovered_vertex = v if v else None
-                    if self.setup_subphase == 'ROAD': e = tile.get_nearest_edge(mx,
-                                                                                my); self.hovered_edge = e if e else None
-                elif self.interaction_mode not in ['move_robber', 'trade', 'monopoly', 'year_of_plenty', 'p2p_trade',
-                                                   'p2p_confirm']:
-                    if self.interaction_mode in ['build_settlement', 'build_city', 'view']: v = tile.get_nearest_vertex(
-                        mx, my); self.hovered_vertex = v if v else None
-                    if self.interaction_mode in ['build_road', 'view']: e = tile.get_nearest_edge(mx,
-                                                                                                  my); self.hovered_edge = e if e else None
-            else:
-                tile.is_highlighted = False
+        hover_key = (mx, my, id(self.board), self.current_player_idx, self.game_phase, self.setup_subphase,
+                     self.interaction_mode)
+        if hover_key == self._hover_key: return
+        self._hover_key = hover_key
+
+        tile = self.board.get_tile_at(mx, my)
+        if self.selected_hex is not None and self.selected_hex is not tile:
+            self.selected_hex.is_highlighted = False
+
+        self.hovered_vertex = None
+        self.hovered_edge = None
+        self.selected_hex = tile
+        if tile is None: return
+
+        tile.is_highlighted = True
+        if self.game_phase == 'SETUP':
+            if self.setup_subphase == 'SETTLEMENT': self.hovered_vertex = self.board.get_nearest_vertex(mx, my)
+            if self.setup_subphase == 'ROAD': self.hovered_edge = self.board.get_nearest_edge(mx, my)
+        elif self.interaction_mode not in ['move_robber', 'trade', 'monopoly', 'year_of_plenty', 'p2p_trade',
+                                           'p2p_responses', 'p2p_confirm']:
+            if self.interaction_mode in ['build_settlement', 'build_city', 'view']:
+                self.hovered_vertex = self.board.get_nearest_vertex(mx, my)
+            if self.interaction_mode in ['build_road', 'view']:
+                self.hovered_edge = self.board.get_nearest_edge(mx, my)
 
     def draw(self):
         if self.winner: self.renderer.draw_winner(self.winner); pygame.display.flip(); return
         self.screen.fill(config.BG_COLOR)
+        dirty = self.dirty_regions
+        player = self.get_current_player()
 
         self.renderer.draw_board(self.board, self.hovered_vertex, self.hovered_edge)
-        self.renderer.draw_ui(self.get_current_player(), self.interaction_mode, self.last_dice_roll)
-
+        panel_rect = self.renderer.draw_ui(player, self.interaction_mode, self.last_dice_roll)
+
+        robber_idx = next((i for i, t in enumerate(self.board.tiles) if t.has_robber), None)
+        if dirty.track('pieces', (id(self.board), len(self.board.built_roads), len(self.board.built_settlements),
+                                  len(self.board.built_cities), robber_idx)):
+            dirty.invalidate()
+
+        dirty.track('panel', (player, player.victory_points, tuple(player.resources.values()),
+                              tuple(player.dev_cards.values()), player.has_longest_road, player.has_largest_army,
+                              self.interaction_mode, self.last_dice_roll), panel_rect)
+
+        odds_rect = None
+        if self.win_probabilities:
+            odds_rect = self.renderer.draw_win_probability(self.players, self.win_probabilities)
+        dirty.track('odds', self.win_probabilities and tuple(self.win_probabilities), odds_rect)
+
+        highlighted = self.selected_hex if self.selected_hex and self.selected_hex.is_highlighted else None
+        dirty.track('highlight', highlighted, self.renderer.tile_rect(highlighted) if highlighted else None)
+        dirty.track('hover_vertex', self.hovered_vertex, None if self.hovered_vertex is None else
+                    self.renderer.vertex_rect(self.board, self.hovered_vertex))
+        dirty.track('hover_edge', self.hovered_edge, None if self.hovered_edge is None else
+                    self.renderer.edge_rect(self.board, self.hovered_edge))
+
+        banner_rect = None
         if self.message:
-            font = pygame.font.SysFont('Arial', 28, bold=True)
-            txt = font.render(self.message, True, (255, 255, 0))
+            txt = render_text(get_font('Arial', 28, bold=True), self.message, (255, 255, 0))
             bg_rect = txt.get_rect(center=(config.SCREEN_WIDTH // 2, 60)).inflate(20, 10)
             pygame.draw.rect(self.screen, (0, 0, 0), bg_rect);
             pygame.draw.rect(self.screen, (255, 255, 255), bg_rect, width=2)
             self.screen.blit(txt, txt.get_rect(center=(config.SCREEN_WIDTH // 2, 60)))
+            banner_rect = bg_rect
+        dirty.track('banner', self.message, banner_rect)
 
+        warning_rect = None
         if self.interaction_mode == 'move_robber':
-            font = pygame.font.SysFont('Arial', 36, bold=True)
-            txt = font.render("MOVE THE ROBBER!", True, (255, 0, 0))
-            self.screen.blit(txt, (config.SCREEN_WIDTH // 2 - 150, 120))
+            txt = render_text(get_font('Arial', 36, bold=True), "MOVE THE ROBBER!", (255, 0, 0))
+            warning_rect = self.screen.blit(txt, (config.SCREEN_WIDTH // 2 - 150, 120))
+        dirty.track('robber_warning', warning_rect is not None, warning_rect)
 
+        menu_key = None
         if self.game_phase == 'MAIN':
             if self.interaction_mode == 'trade':
                 self.renderer.draw_trade_menu(self.trade_offer, self.get_current_player())
+                menu_key = (self.interaction_mode, self.trade_offer)
             elif self.interaction_mode == 'p2p_trade':
                 self.renderer.draw_p2p_menu(self)
+                menu_key = (self.interaction_mode, str(self.p2p_offer), self.p2p_active_side)
+            elif self.interaction_mode == 'p2p_responses':
+                self.renderer.draw_p2p_responses(self)
+                menu_key = (self.interaction_mode, id(self.p2p_responses))
             elif self.interaction_mode == 'p2p_confirm':
                 self.renderer.draw_p2p_confirm(self)
+                menu_key = (self.interaction_mode, self.p2p_target_idx)
             elif self.interaction_mode == 'monopoly':
                 self.renderer.draw_monopoly_menu()
+                menu_key = (self.interaction_mode,)
             elif self.interaction_mode == 'year_of_plenty':
                 self.renderer.draw_yop_menu(len(self.yop_selected_resources))
+                menu_key = (self.interaction_mode, len(self.yop_selected_resources))
+        # Menus are full-screen overlays, so opening, closing or changing one repaints everything.
+        if dirty.track('menu', menu_key):
+            dirty.invalidate()
+
+        if config.DIRTY_RECTS:
+            dirty.flush()
+        else:
+            pygame.display.flip()
 
-        pygame.display.flip()
+    def handle_events(self, events):
+        self.input_manager.handle_input(events)
 
-    def handle_events(self):
-        self.input_manager.handle_input()
+    def is_idle(self):
+        # Stays awake while a win-probability estimate is on its way, so the bar updates without input.
+        if self.win_odds and self.win_odds.is_busy() and not self.winner: return False
+        return config.IDLE_MODE and (self.winner or not self.get_current_player().is_ai)
+
+    def wait_for_events(self):
+        # Sleeps until input arrives or the current message expires, instead of spinning at FPS.
+        event = pygame.event.wait(max(self.message_timer, 0))
+        events = [] if event.type == pygame.NOEVENT else [event]
+        return events + pygame.event.get()
 
     def run(self):
+        self.clock.tick()
         while self.running:
-            self.handle_events()
-            self.update()
+            idle = self.is_idle()
+            events = self.wait_for_events() if idle else pygame.event.get()
+            self.handle_events(events)
+
+            elapsed = self.clock.tick(config.FPS)
+            message_changed = self.update_message(elapsed)
+            if idle and not events and not message_changed: continue
+
+            self.update(elapsed)
             self.draw()
-            self.clock.tick(config.FPS)
+        if self.search_pool: self.search_pool.terminate()
+        if self.odds_pool: self.odds_pool.terminate()
         pygame.quit()
         sys.exit()
 
@@ -0,0 +1,75 @@
+import argparse
+import json
+import os
+import time
+from functools import partial
+from multiprocessing import Pool
+
+from core.board_generator import BoardPool
+from core.simulation import play_game
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run AI-vs-AI Catan games in parallel.")
+    parser.add_argument('-n', '--games', type=int, default=100, help="number of games to play")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('-s', '--seed', type=int, default=0, help="seed of the first game; game i uses seed + i")
+    parser.add_argument('-p', '--players', type=int, default=4, help="AI players per game")
+    parser.add_argument('--radius', type=int, default=2, help="board radius in hex rings (2 is the standard board)")
+    parser.add_argument('--mcts-players', type=int, default=0, help="seats (from the first) played by the MCTS AI")
+    parser.add_argument('--mcts-iterations', type=int, default=200,
+                        help="MCTS iterations per decision, 0 to be limited by the time budgets only")
+    parser.add_argument('--decision-budget', type=float, help="seconds an MCTS player may think about one move")
+    parser.add_argument('--turn-budget', type=float, help="seconds an MCTS player may think during one turn")
+    parser.add_argument('--no-player-trades', action='store_true', help="keep AIs from trading with each other")
+    parser.add_argument('--max-turns', type=int, default=1000, help="stop a game without a winner after this many turns")
+    parser.add_argument('-o', '--output', default="results.jsonl", help="file receiving one JSON line per game")
+    parser.add_argument('--board-pool', help="draw boards from a pool written by generate_boards.py")
+    args = parser.parse_args()
+    if args.mcts_iterations == 0 and args.decision_budget is None and args.turn_budget is None:
+        parser.error("--mcts-iterations 0 needs --decision-budget or --turn-budget")
+    if args.board_pool and BoardPool.load(args.board_pool).radius != args.radius:
+        parser.error(f"{args.board_pool} holds boards of another radius than --radius {args.radius}")
+    return args
+
+
+_board_pool = None
+
+
+def _init_worker(board_pool_file):
+    # Each worker loads the pool once instead of receiving it with every task.
+    global _board_pool
+    _board_pool = BoardPool.load(board_pool_file) if board_pool_file else None
+
+
+def _play(seed, num_players, max_turns, radius, mcts_players, mcts_iterations, decision_budget, turn_budget,
+          player_trades):
+    return play_game(seed, num_players, max_turns, _board_pool, radius, mcts_players, mcts_iterations,
+                     decision_budget, turn_budget, player_trades)
+
+
+def main():
+    args = parse_args()
+    seeds = range(args.seed, args.seed + args.games)
+    worker = partial(_play, num_players=args.players, max_turns=args.max_turns, radius=args.radius,
+                     mcts_players=args.mcts_players, mcts_iterations=args.mcts_iterations,
+                     decision_budget=args.decision_budget, turn_budget=args.turn_budget,
+                     player_trades=not args.no_player_trades)
+
+    start = time.perf_counter()
+    wins = {}
+    with open(args.output, "w") as out, Pool(args.workers, _init_worker, (args.board_pool,)) as pool:
+        for done, result in enumerate(pool.imap_unordered(worker, seeds), 1):
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            wins[result['winner']] = wins.get(result['winner'], 0) + 1
+            print(f"[{done}/{args.games}] seed {result['seed']}: {result['winner']} in {result['turns']} turns")
+
+    elapsed = time.perf_counter() - start
+    print(f"Played {args.games} games in {elapsed:.1f}s ({args.games / elapsed:.1f} games/s)")
+    for name, count in sorted(wins.items(), key=lambda item: -item[1]):
+        print(f"  {name}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+from core.game_engine import GameEngine
+from core.game_state import GameState
+from core.player import Player
+
+
+def brute_force(board, player):
+    # Every trail from every road end, with no pruning.
+    best = 0
+
+    def walk(v, used):
+        nonlocal best
+        best = max(best, len(used))
+        owner = board.get_building_owner(v)
+        if used and owner is not None and owner != player: return
+        for eid in board.vertex_edges[v]:
+            if eid in used or board.built_roads.get(eid) != player: continue
+            a, b = board.edge_vertices[eid]
+            walk(b if a == v else a, used | {eid})
+
+    for eid, owner in board.built_roads.items():
+        if owner == player:
+            for v in board.edge_vertices[eid]: walk(v, frozenset())
+    return best
+
+
+def assert_lengths(game):
+    state = GameState.from_game(game)
+    for i, player in enumerate(game.players):
+        expected = brute_force(game.board, player)
+        assert game.board.calculate_longest_road(player) == expected
+        assert state._longest_trail(i) == expected
+
+
+def edge_between(board, a, b):
+    return next(eid for eid in board.vertex_edges[a] if b in board.edge_vertices[eid])
+
+
+def test_loop_next_to_an_open_path():
+    game = GameEngine([Player("A", (0, 0, 0), True), Player("B", (0, 0, 0), True)], seed=25)
+    board, player = game.board, game.players[0]
+
+    ring = board.tiles[0].vertex_ids
+    assert board.place_settlement(ring[0], player, initial_phase=True)
+    for i in range(6):
+        assert board.place_road(edge_between(board, ring[i], ring[(i + 1) % 6]), player)
+
+    # A separate four-road path, as far from the ring as the board allows
+    ring_x, ring_y = board.vertex_positions[ring[0]]
+    far = max(board.get_all_possible_settlement_spots(player, initial_phase=True),
+              key=lambda v: (board.vertex_positions[v][0] - ring_x) ** 2 + (board.vertex_positions[v][1] - ring_y) ** 2)
+    assert board.place_settlement(far, player, initial_phase=True)
+    path = [far]
+    for _ in range(4):
+        step = next(n for n in board.vertex_neighbors[path[-1]] if n not in path and n not in ring)
+        assert board.place_road(edge_between(board, path[-1], step), player)
+        path.append(step)
+
+    assert brute_force(board, player) == 6
+    assert_lengths(game)
+
+
+def test_random_games():
+    for seed in range(6):
+        game = GameEngine([Player(f"AI {i}", (0, 0, 0), True) for i in range(4)], seed=seed)
+        while not game.check_winner() and game.turn_count < 200:
+            game.play_ai_turn()
+            assert_lengths(game)
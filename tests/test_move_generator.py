@@ -0,0 +1,35 @@
+from core.game_engine import GameEngine
+from core.player import Player
+
+
+def brute_force(board, player, initial_phase=False):
+    # Every vertex and edge checked against the rules, without the move generator's sets.
+    def free(v): return board.get_building_owner(v) is None
+    def has_road(v): return any(board.built_roads.get(eid) == player for eid in board.vertex_edges[v])
+
+    settlements = [v for v in range(len(board.vertex_positions))
+                   if free(v) and all(free(n) for n in board.vertex_neighbors[v])
+                   and (initial_phase or has_road(v))]
+    roads = [eid for eid, (a, b) in enumerate(board.edge_vertices) if eid not in board.built_roads
+             and any(board.get_building_owner(v) == player or has_road(v) for v in (a, b))]
+    cities = sorted(v for v, owner in board.built_settlements.items() if owner == player)
+    return settlements, roads, cities
+
+
+def assert_spots(game):
+    board = game.board
+    for player in game.players:
+        settlements, roads, cities = brute_force(board, player)
+        assert board.get_all_possible_settlement_spots(player) == settlements
+        assert board.get_all_possible_road_spots(player) == roads
+        assert board.get_all_possible_city_spots(player) == cities
+        assert board.get_all_possible_settlement_spots(player, initial_phase=True) == brute_force(board, player, True)[0]
+
+
+def test_random_games():
+    for seed in range(4):
+        game = GameEngine([Player(f"AI {i}", (0, 0, 0), True) for i in range(4)], seed=seed)
+        assert_spots(game)
+        while not game.check_winner() and game.turn_count < 150:
+            game.play_ai_turn()
+            assert_spots(game)
@@ -0,0 +1,28 @@
+from core.game_engine import GameEngine
+from core.player import Player
+
+
+def brute_force(board, roll):
+    # Every building on every unblocked tile with the number, scanned tile by tile.
+    expected = {}
+    for tile in board.tiles:
+        if tile.number_token != roll or tile.has_robber: continue
+        for vid in tile.vertex_ids:
+            if vid in board.built_settlements:
+                expected[(vid, tile)] = (board.built_settlements[vid], tile.resource_type, 1)
+            elif vid in board.built_cities:
+                expected[(vid, tile)] = (board.built_cities[vid], tile.resource_type, 2)
+    return expected
+
+
+def assert_production(game):
+    for roll in range(2, 13):
+        assert game.board.production[roll] == brute_force(game.board, roll)
+
+
+def test_random_games():
+    for seed in range(6):
+        game = GameEngine([Player(f"AI {i}", (0, 0, 0), True) for i in range(4)], seed=seed)
+        while not game.check_winner() and game.turn_count < 200:
+            game.play_ai_turn()
+            assert_production(game)
@@ -0,0 +1,34 @@
+import random
+
+from core.game_engine import GameEngine
+from core.game_state import GameState
+from core.player import Player
+
+
+def new_game(seed):
+    return GameEngine([Player(f"AI {i}", (0, 0, 0), True) for i in range(4)], seed=seed)
+
+
+def test_random_actions():
+    # The hash kept up to date move by move against one computed from scratch
+    for seed in range(6):
+        rng = random.Random(seed)
+        state = GameState.from_game(new_game(seed))
+        assert state.hash == state.compute_hash()
+        for _ in range(400):
+            actions = state.legal_actions()
+            if not actions: break
+            state.apply(rng.choice(actions), rng)
+            assert state.hash == state.compute_hash()
+
+            copy = state.clone()
+            assert copy.hash == state.hash
+
+
+def test_random_games():
+    for seed in range(6):
+        game = new_game(seed)
+        assert game.state_hash() == GameState.from_game(game).hash
+        while not game.check_winner() and game.turn_count < 200:
+            game.play_ai_turn()
+            assert game.state_hash() == GameState.from_game(game).hash
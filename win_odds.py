@@ -0,0 +1,37 @@
+import argparse
+import random
+import time
+
+from core.game_engine import GameEngine
+from core.game_state import GameState
+from core.win_probability import WinProbability
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate every player's chance to win from saved games.")
+    parser.add_argument('saves', nargs='+', help="save files written by the game (S key)")
+    parser.add_argument('-r', '--rollouts', type=int, default=1000, help="rollouts per position")
+    parser.add_argument('-s', '--seed', type=int, default=None, help="seed for reproducible estimates")
+    parser.add_argument('--max-turns', type=int, default=300,
+                        help="rollout length before an undecided game goes to the VP leaders")
+    args = parser.parse_args()
+
+    estimator = WinProbability(args.rollouts, args.max_turns)
+    rng = random.Random(args.seed)
+    for filename in args.saves:
+        game = GameEngine(seed=args.seed)
+        game.storage_manager.load_game(filename)
+        if game.message != "Game Loaded!":
+            print(f"{filename}: {game.message}")
+            continue
+
+        start = time.perf_counter()
+        probabilities = estimator.estimate(GameState.from_game(game), rng)
+        elapsed = time.perf_counter() - start
+        print(f"{filename}: {game.get_current_player().name} to play, {args.rollouts} rollouts in {elapsed:.1f}s")
+        for player, chance in sorted(zip(game.players, probabilities), key=lambda item: -item[1]):
+            print(f"  {player.name}: {chance:.1%} ({player.update_victory_points()} VP)")
+
+
+if __name__ == "__main__":
+    main()